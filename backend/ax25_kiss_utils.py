@@ -1,5 +1,6 @@
 import struct
 import zlib
+from functools import lru_cache
 
 # Constants
 FEND = 0xC0
@@ -7,6 +8,10 @@ FESC = 0xDB
 TFEND = 0xDC
 TFESC = 0xDD
 
+# Fixed KISS framing bytes (FEND + data-frame command, trailing FEND)
+KISS_PREFIX = bytes([FEND, 0x00])
+KISS_SUFFIX = bytes([FEND])
+
 def calculate_checksum(data):
     """Calculate CRC32 checksum."""
     return zlib.crc32(data)
@@ -21,6 +26,21 @@ def encode_ax25_address(callsign, ssid, is_last):
     encoded.append(ssid_byte)
     return encoded
 
+@lru_cache(maxsize=64)
+def _decode_ax25_address(address_bytes):
+    """Decode a 7-byte AX.25 address field; cached since a session's source never changes."""
+    # Unpack the callsign bytes and the SSID byte
+    callsign_bytes, ssid_byte = struct.unpack(">6sB", address_bytes)
+    # Decode the callsign by right-shifting each byte by 1 bit
+    callsign = ''.join(chr(byte >> 1) for byte in callsign_bytes).strip()
+    
+    # Extract and decode the SSID
+    ssid = (ssid_byte >> 1) & 0x0F
+    if 1 <= ssid <= 15:
+        callsign = f"{callsign}-{ssid}"
+
+    return callsign
+
 def decode_ax25_callsign(frame, start_index):
     """Decode a callsign from the AX.25 frame using structured parsing."""
     adjusted_start_index = start_index + 1  # Adjust the start index as needed
@@ -30,18 +50,7 @@ def decode_ax25_callsign(frame, start_index):
         return ""
 
     try:
-        # Unpack the callsign bytes and the SSID byte
-        callsign_bytes, ssid_byte = struct.unpack(">6sB", frame[adjusted_start_index:adjusted_start_index + 7])
-        # Decode the callsign by right-shifting each byte by 1 bit
-        callsign = ''.join(chr(byte >> 1) for byte in callsign_bytes).strip()
-        
-        # Extract and decode the SSID
-        ssid = (ssid_byte >> 1) & 0x0F
-        if 1 <= ssid <= 15:
-            callsign = f"{callsign}-{ssid}"
-
-        return callsign
-
+        return _decode_ax25_address(bytes(frame[adjusted_start_index:adjusted_start_index + 7]))
     except struct.error as e:
         print(f"Struct unpacking error: {e}")
         return ""
@@ -58,16 +67,9 @@ def clean_message(ax25_frame):
 
 def kiss_wrap(ax25_frame):
     """Wrap the AX.25 frame in a KISS frame for transmission."""
-    framed = [FEND, 0x00]
-    for byte in ax25_frame:
-        if byte == FEND:
-            framed.extend([FESC, TFEND])
-        elif byte == FESC:
-            framed.extend([FESC, TFESC])
-        else:
-            framed.append(byte)
-    framed.append(FEND)
-    return bytes(framed)
+    # Escape FESC first so the escapes inserted for FEND are not re-escaped
+    body = bytes(ax25_frame).replace(b'\xdb', b'\xdb\xdd').replace(b'\xc0', b'\xdb\xdc')
+    return b''.join((KISS_PREFIX, body, KISS_SUFFIX))
 
 def kiss_unwrap(kiss_frame):
     """Unwrap a KISS frame and return the AX.25 data."""
@@ -87,15 +89,16 @@ def kiss_unwrap(kiss_frame):
             index += 1
     return bytes(unwrapped)
 
-def build_ax25_frame(source, destination, message):
-    """Build an AX.25 frame."""
+@lru_cache(maxsize=32)
+def build_ax25_header(source, destination):
+    """Build the 16-byte AX.25 address/control/PID header for a callsign pair."""
     destination_addr = encode_ax25_address(destination[0], destination[1], is_last=False)
     source_addr = encode_ax25_address(source[0], source[1], is_last=True)
-    control_field = [0x03]
-    pid_field = [0xF0]
+    return bytes(destination_addr + source_addr + [0x03, 0xF0])
+
+def build_ax25_frame(source, destination, message):
+    """Build an AX.25 frame."""
+    header = build_ax25_header(tuple(source), tuple(destination))
     if isinstance(message, str):
-        info_field = list(message.encode('latin-1'))
-    else:
-        info_field = list(message)
-    ax25_frame = destination_addr + source_addr + control_field + pid_field + info_field
-    return ax25_frame
+        return header + message.encode('latin-1')
+    return header + bytes(message)
@@ -1,5 +1,8 @@
 import logging
+import queue
 import signal
+import sys
+import threading
 import time
 import sqlite3
 import json
@@ -29,7 +32,7 @@ class Client:
         socketio_logger.info("[CLIENT] Client stopping...")
         logging.info("Client stopping...")
 
-    def connect_and_send_request(self, server_callsign, request_type, count, additional_params=None):
+    def connect_and_send_request(self, server_callsign, request_type, count, additional_params=None, timeout=None):
         """
         Send a request with type to the server.
         
@@ -38,6 +41,7 @@ class Client:
             request_type: NoteRequestType enum value
             count: Number of notes to request
             additional_params: Optional string of additional parameters
+            timeout: Optional override of config.CONNECTION_TIMEOUT for this request
         """
         if not self.session or self.session.state == ModemState.DISCONNECTED:
             # --- FIX: Safe Reticulum Check ---
@@ -67,6 +71,9 @@ class Client:
             self.core.protocol_manager.get_protocol_type() == 'PacketProtocol':
                 time.sleep(config.CONNECTION_STABILIZATION_DELAY * 1.3)
 
+        # Scoped to this session, so the shared config value is never modified
+        self.session.connection_timeout = timeout
+
         try:
             # For specific user requests, derive NPUB from stored NSEC
             if request_type == NoteRequestType.SPECIFIC_USER and additional_params is None:
@@ -447,14 +454,28 @@ class Client:
             finally:
                 conn.close()
 
+    def _read_requests(self, requests):
+        """Feed stdin lines into the request queue; None signals EOF."""
+        for line in iter(sys.stdin.readline, ''):
+            requests.put(line.strip())
+        requests.put(None)
+
     def run(self):
         signal.signal(signal.SIGINT, lambda signum, frame: self.stop())
         signal.signal(signal.SIGTERM, lambda signum, frame: self.stop())
 
+        # Read stdin on a background thread so stop() is honoured while idle at the prompt
+        requests = queue.Queue()
+        threading.Thread(target=self._read_requests, args=(requests,), daemon=True).start()
+        print("Enter your request (or 'quit' to exit): ", end='', flush=True)
+
         try:
             while self.running:
-                request = input("Enter your request (or 'quit' to exit): ")
-                if request.lower() == 'quit':
+                try:
+                    request = requests.get(timeout=1.0)
+                except queue.Empty:
+                    continue
+                if request is None or request.lower() == 'quit':
                     break
                 success, response = self.connect_and_send_request(config.S_CALLSIGN, request)
                 if not success:
@@ -463,6 +484,7 @@ class Client:
                 else:
                     socketio_logger.info(f"[CONTROL] Received response: {response}")
                     logging.info(f"Received response: {response}")
+                print("Enter your request (or 'quit' to exit): ", end='', flush=True)
         except Exception as e:
             socketio_logger.error(f"[SYSTEM] An error occurred: {e}")
             logging.error(f"An error occurred: {e}")
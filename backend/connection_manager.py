@@ -434,7 +434,7 @@ class ConnectionManager:
                         return session
                 
                 # Clean up sessions that are inactive (timeout)
-                if session and hasattr(session, 'last_activity') and time.time() - session.last_activity > config.CONNECTION_TIMEOUT:
+                if session and hasattr(session, 'last_activity') and time.time() - session.last_activity > self.core.connection_timeout(session):
                     logging.info(f"Connection timeout for {session.remote_callsign}")
                     try:
                         self.cleanup_session(session)
@@ -1,15 +1,17 @@
 import logging
+import selectors
+import socket
+import threading
 import time
 import config
 from models import Session, ModemState, MessageType
 from ax25_kiss_utils import build_ax25_frame, kiss_wrap, clean_message, kiss_unwrap, decode_ax25_callsign
 from networking import create_tnc_connection, receive_packet, send_frame
-from protocol_utils import calculate_crc32, parse_callsign, estimate_transmission_time
+from protocol_utils import calculate_crc32, parse_callsign, estimate_transmission_time, parse_ack_seq
 from connection_manager import ConnectionManager
 from packet_handler import PacketHandler
 from message_processor import MessageProcessor
 from utils import wait_for_specific_message, wait_for_ack
-import utils
 from socketio_logger import get_socketio_logger
 from nsec_storage import NSECStorage
 
@@ -48,6 +50,10 @@ class Core:
         self.tnc_port = config.SERVER_PORT if is_server else config.CLIENT_PORT
         self.callsign = parse_callsign(config.S_CALLSIGN if is_server else config.C_CALLSIGN)
         
+        # One selector for the TNC socket; receive_message blocks on it until data arrives
+        self._reactor = selectors.DefaultSelector()
+        self._reactor_lock = threading.Lock()
+        
         # Always initialize legacy components FIRST (backend_manager needs these!)
         self.connection_manager = ConnectionManager(is_server, self)
         self.packet_handler = PacketHandler(self)
@@ -133,6 +139,7 @@ class Core:
                     logging.error(f"[CORE] Error during backend cleanup: {e}")
             
             # Clean up connection manager (for legacy packet system)
+            self._release_reactor()
             if self.connection_manager:
                 self.connection_manager.stop()
                 
@@ -164,8 +171,8 @@ class Core:
     def wait_for_specific_message(self, session, expected_type, timeout=config.ACK_TIMEOUT):
         return wait_for_specific_message(self, session, expected_type, timeout)
     
-    def wait_for_ack(self, session, timeout=config.ACK_TIMEOUT):
-        return wait_for_ack(self, session, timeout)
+    def wait_for_ack(self, session, timeout=config.ACK_TIMEOUT, resend_message=None, resend_type=None):
+        return wait_for_ack(self, session, timeout, resend_message, resend_type)
     
     def disconnect(self, session):
         self.connection_manager.disconnect(session)
@@ -188,13 +195,63 @@ class Core:
         logging.warning("Timeout waiting for DISCONNECT_ACK")
         return False
 
+    def _tnc_connection_closed(self, tnc_connection):
+        """True if there is no open TNC link left to read from."""
+        if tnc_connection is None:
+            return True
+        if isinstance(tnc_connection, socket.socket):
+            return tnc_connection.fileno() < 0
+        return hasattr(tnc_connection, 'is_open') and not tnc_connection.is_open
+
+    def connection_closed(self, session):
+        """True once the TNC link receive_message reads for this session is gone."""
+        tnc_connection = session.tnc_connection if session else self.connection_manager.tnc_connection
+        return self._tnc_connection_closed(tnc_connection)
+
+    def _wait_readable(self, tnc_connection, timeout):
+        """Wait on the reactor until a TNC socket is readable.
+
+        Returns None once the link is closed; serial links always return True.
+        """
+        if self._tnc_connection_closed(tnc_connection):
+            return None
+        if not isinstance(tnc_connection, socket.socket):
+            return True
+        
+        with self._reactor_lock:
+            registered = self._reactor.get_map()
+            if not any(key.fileobj is tnc_connection for key in registered.values()):
+                # Core reads one TNC link at a time; drop whatever the previous one left
+                for key in list(registered.values()):
+                    self._reactor.unregister(key.fd)
+                self._reactor.register(tnc_connection, selectors.EVENT_READ)
+        
+        try:
+            return bool(self._reactor.select(timeout))
+        except OSError:
+            # select() fails on Windows if the socket is closed while we wait
+            return None if self._tnc_connection_closed(tnc_connection) else False
+
+    def _release_reactor(self):
+        """Unregister the TNC socket so a closed fd never stays in the selector."""
+        with self._reactor_lock:
+            for key in list(self._reactor.get_map().values()):
+                self._reactor.unregister(key.fd)
+
     def receive_message(self, session, timeout=None):
         start_time = time.time()
         last_log_time = start_time
         tnc_connection = session.tnc_connection if session else self.connection_manager.tnc_connection
         
         while timeout is None or time.time() - start_time < timeout:
-            source_callsign, ax25_frame = receive_packet(tnc_connection, timeout=0.1)
+            wait = 1.0 if timeout is None else min(1.0, timeout - (time.time() - start_time))
+            readable = self._wait_readable(tnc_connection, wait)
+            if readable is None:
+                break  # Link is gone; nothing more will arrive
+            if readable:
+                source_callsign, ax25_frame = receive_packet(tnc_connection, timeout=0.1)
+            else:
+                source_callsign, ax25_frame = None, None
             if ax25_frame:
                 try:
                     message = clean_message(ax25_frame)
@@ -370,8 +427,8 @@ class Core:
                         if msg_type == MessageType.ACK and message:
                             try:
                                 # Check if this is an ACK for our packet
-                                if "|" in message:
-                                    _, ack_seq = message.split("|", 1)
+                                ack_seq = parse_ack_seq(message)
+                                if ack_seq is not None:
                                     if int(ack_seq) == seq_num:
                                         session.acked_packets.add(seq_num)
                                         progress = (len(session.acked_packets) / total_packets) * 100
@@ -411,7 +468,7 @@ class Core:
         
         # Wait for DONE_ACK or handle PKT_MISSING
         start_time = time.time()
-        while time.time() - start_time < config.CONNECTION_TIMEOUT:
+        while time.time() - start_time < self.connection_timeout(session):
             source_callsign, message, msg_type = self.receive_message(session, timeout=1.0)
             if msg_type == MessageType.DONE_ACK:
                 socketio_logger.info("[CONTROL] Received DONE_ACK")
@@ -579,6 +636,10 @@ class Core:
     def handle_disconnect(self, session):
         self.connection_manager.handle_disconnect(session)
 
+    def connection_timeout(self, session):
+        """Session's per-request timeout if one was set, else config.CONNECTION_TIMEOUT."""
+        return getattr(session, 'connection_timeout', None) or config.CONNECTION_TIMEOUT
+
     def receive_response(self, session):
         start_time = time.time()
         response_parts = {}
@@ -594,7 +655,7 @@ class Core:
                 return set()
             return set(range(1, total_packets + 1)) - set(response_parts.keys())
 
-        while time.time() - start_time < config.CONNECTION_TIMEOUT:
+        while time.time() - start_time < self.connection_timeout(session):
             current_time = time.time()
             if current_time - last_packet_time > config.NO_PACKET_TIMEOUT:
                 socketio_logger.warning(f"[PACKET] No packets received for {config.NO_PACKET_TIMEOUT} seconds.")
@@ -706,7 +767,7 @@ class Core:
             if self.wait_for_ready(session, timeout=config.ACK_TIMEOUT * 2):
                 if self.send_ready(session):
                     start_time = time.time()
-                    while missing_packets and time.time() - start_time < config.CONNECTION_TIMEOUT:
+                    while missing_packets and time.time() - start_time < self.connection_timeout(session):
                         source_callsign, message, msg_type = self.receive_message(session, timeout=1.0)
                         if msg_type == MessageType.RESPONSE:
                             try:
@@ -789,6 +850,7 @@ class Core:
 
 
     def cleanup_session(self, session):
+        self._release_reactor()
         if session.id in self.sessions:
             self.sessions.pop(session.id, None)
             socketio_logger.info(f"[SYSTEM] Disconnected session: {session.id}")
@@ -1,8 +1,8 @@
-from enum import Enum
+from enum import Enum, IntEnum
 import time
 
 
-class MessageType(Enum):
+class MessageType(IntEnum):
     DATA_REQUEST = 1
     RESPONSE = 2
     ACK = 3
@@ -29,6 +29,13 @@ class MessageType(Enum):
     ZAP_SUCCESS_CONFIRM = 22     # Client confirms payment success
     ZAP_FAILED = 23             # Client reports payment failure
 
+    # IntEnum would render as the bare number; keep "MessageType.NAME" in logs
+    def __str__(self):
+        return f"{self.__class__.__name__}.{self.name}"
+
+    def __format__(self, format_spec):
+        return format(str(self), format_spec)
+
 # New SessionState enum
 class SessionState(Enum):
     IDLE = 0
@@ -128,6 +135,7 @@ class Session:
         self.is_note_writing = False
         self.note_type = None  # Track type of note being sent
         self.reply_context = None  # Store note_id and pubkey for replies
+        self.connection_timeout = None  # Per-request override of config.CONNECTION_TIMEOUT
         
         # New NWC zap session data (for caching during multi-step process)
         self.zap_lightning_invoice = None    # Cache LN invoice for retry
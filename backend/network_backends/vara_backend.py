@@ -6,6 +6,7 @@ from vara_test.py while maintaining compatibility with existing HAMSTR functiona
 """
 
 import socket
+import selectors
 import logging
 import time
 import threading
@@ -25,11 +26,26 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
 from ax25_kiss_utils import build_ax25_frame, kiss_wrap, kiss_unwrap, decode_ax25_callsign
 
+class _CachedTimeFormatter(logging.Formatter):
+    """Formatter that only calls strftime once per second of log output."""
+    _cache = (None, '')
+
+    def formatTime(self, record, datefmt=None):
+        if datefmt:
+            return super().formatTime(record, datefmt)
+        second = int(record.created)
+        cached_second, cached_text = self._cache
+        if cached_second != second:
+            cached_text = time.strftime(self.default_time_format, self.converter(second))
+            self._cache = (second, cached_text)
+        return self.default_msec_format % (cached_text, record.msecs)
+
 # Force immediate log flushing
+_stdout_handler = logging.StreamHandler(sys.stdout)
+_stdout_handler.setFormatter(_CachedTimeFormatter('%(asctime)s - %(levelname)s - %(message)s'))
 logging.basicConfig(
     level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[logging.StreamHandler(sys.stdout)]
+    handlers=[_stdout_handler]
 )
 sys.stdout.reconfigure(line_buffering=True)
 
@@ -41,10 +57,16 @@ class VARASession:
         self.connected = True
         self.last_activity = time.time()
         self._lock = threading.Lock()
-        self._receive_buffers = {}
-        self._json_buffers = {}
+        # Reassembly buffers, grown/trimmed in place; recv_into() fills the scratch view
+        self.receive_buffer = bytearray()
+        self.json_buffer = bytearray()
+        self.recv_view = memoryview(bytearray(4096))
         self.id = f"{remote_callsign[0]}-{remote_callsign[1]}"
         self.tnc_connection = data_socket
+        # Registered once so receive loops wait via select() instead of settimeout()
+        self.selector = selectors.DefaultSelector()
+        if data_socket:
+            self.selector.register(data_socket, selectors.EVENT_READ)
         from models import ModemState
         self.state = ModemState.CONNECTED
     
@@ -67,6 +89,8 @@ class VARABackend(NetworkBackend):
         self._ptt_monitor_thread = None
         self._vara_messages = []
         self._message_lock = threading.Lock()
+        # Monitor thread notifies waiters when new command-port lines arrive
+        self._message_event = threading.Condition(self._message_lock)
         self._last_buffer_level = 0
         self._last_buffer_change_time = time.time()
         self._is_transmitting = False
@@ -194,21 +218,25 @@ class VARABackend(NetworkBackend):
 
     def _monitor_vara_ptt(self):
         logging.info("[VARA_PTT] Monitor thread starting")
-        buffer_pattern = re.compile(r'BUFFER (\d+)')
+        buffer_pattern = re.compile(rb'BUFFER (\d+)')
+        try:
+            self._listening_command_socket.settimeout(1.0)
+        except (OSError, AttributeError):
+            pass
         
         while self._vara_ready and self._listening_command_socket:
             try:
-                self._listening_command_socket.settimeout(1.0)
                 data = self._listening_command_socket.recv(1024)
                 
                 if data:
-                    raw_msg = data.decode('ascii', errors='ignore').strip()
-                    for line in raw_msg.split('\r'):
+                    # Command port replies are plain ASCII; keep lines as bytes
+                    for line in data.split(b'\r'):
                         line = line.strip()
                         if not line: continue
                         
-                        with self._message_lock:
+                        with self._message_event:
                             self._vara_messages.append(line)
+                            self._message_event.notify_all()
                         
                         buffer_match = buffer_pattern.search(line)
                         if buffer_match:
@@ -217,13 +245,13 @@ class VARABackend(NetworkBackend):
                                 self._last_buffer_level = current_buffer
                                 self._last_buffer_change_time = time.time()
 
-                        if line == 'PTT ON':
+                        if line == b'PTT ON':
                             self._is_transmitting = True
                             logging.info("[VARA_PTT] *** PTT ON ***")
                             socketio_logger.info("[CONTROL] ⚡ PTT ON")
                             if self.ptt and not self.ptt.is_keyed: self.ptt.key()
                         
-                        elif line == 'PTT OFF':
+                        elif line == b'PTT OFF':
                             self._is_transmitting = False
                             self._last_buffer_level = 0
                             self._last_buffer_change_time = time.time()
@@ -242,18 +270,23 @@ class VARABackend(NetworkBackend):
                 break
         
         self._vara_ready = False
+        with self._message_event:
+            self._message_event.notify_all()
         logging.info("[VARA_PTT] Monitor stopped")
 
     def _wait_for_vara_message(self, search_string: str, timeout: float = 30) -> bool:
-        start = time.time()
-        while time.time() - start < timeout:
-            with self._message_lock:
+        search_bytes = search_string.encode('ascii')
+        deadline = time.monotonic() + timeout
+        with self._message_event:
+            while True:
                 for msg in self._vara_messages:
-                    if search_string in msg:
+                    if search_bytes in msg:
                         self._vara_messages.clear()
                         return True
-            time.sleep(0.1)
-        return False
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._message_event.wait(remaining)
         
     def _setup_vara_config(self, config):
         try:
@@ -271,6 +304,7 @@ class VARABackend(NetworkBackend):
                 self.data_port = 8301
                 self.my_callsign = getattr(config, 'C_CALLSIGN', '(TEST, 1)')
             
+            self._local_callsign = self._parse_callsign(self.my_callsign)
             logging.info(f"[VARA_BACKEND] Config - Role: {'server' if self.is_server else 'client'}, Callsign: {self.my_callsign}")
         except Exception as e:
             logging.error(f"[VARA_BACKEND] Config setup error: {e}")
@@ -278,13 +312,13 @@ class VARABackend(NetworkBackend):
             self.command_port = 8400 if self.is_server else 8300
             self.data_port = 8401 if self.is_server else 8301
             self.my_callsign = '(TEST, 2)' if self.is_server else '(TEST, 1)'
+            self._local_callsign = self._parse_callsign(self.my_callsign)
 
     def _send_vara_command(self, sock: socket.socket, command: str) -> Optional[str]:
         try:
             sock.sendall((command + '\r').encode('ascii'))
-            sock.settimeout(5)
             response = sock.recv(1024).decode('ascii', errors='ignore').strip()
-            logging.debug(f"[VARA_BACKEND] Command: {command} -> Response: {response}")
+            logging.debug("[VARA_BACKEND] Command: %s -> Response: %s", command, response)
             return response
         except Exception as e:
             logging.error(f"[VARA_BACKEND] Command '{command}' failed: {e}")
@@ -336,21 +370,23 @@ class VARABackend(NetworkBackend):
                 connected = False
                 incoming_callsign_str = None
                 
-                while not connected:
-                    if not self._vara_ready:
-                        logging.error("[VARA_BACKEND] Monitor died while waiting. Aborting.")
-                        return None
-                    with self._message_lock:
-                        for msg in list(self._vara_messages):
-                            if msg.startswith("CONNECTED"):
+                with self._message_event:
+                    while not connected:
+                        if not self._vara_ready:
+                            logging.error("[VARA_BACKEND] Monitor died while waiting. Aborting.")
+                            return None
+                        for msg in self._vara_messages:
+                            if msg.startswith(b"CONNECTED"):
                                 connected = True
+                                msg = msg.decode('ascii', errors='ignore')
                                 logging.info(f"[VARA_BACKEND] Connection detected: {msg}")
                                 parts = msg.split()
                                 if len(parts) >= 3: incoming_callsign_str = parts[2]
                                 elif len(parts) >= 2: incoming_callsign_str = parts[1]
                                 self._vara_messages.clear()
                                 break
-                    if not connected: time.sleep(0.1)
+                        # Woken by the monitor on new lines; timeout re-checks _vara_ready
+                        if not connected: self._message_event.wait(1.0)
 
                 if incoming_callsign_str:
                     remote_call, remote_ssid = self._parse_callsign(incoming_callsign_str)
@@ -413,11 +449,10 @@ class VARABackend(NetworkBackend):
     def send_data(self, session: VARASession, data: bytes) -> bool:
         try:
             if not session or not session.connected: return False
-            local_call, local_ssid = self._parse_callsign(self.my_callsign)
-            ax25_frame = build_ax25_frame((local_call, local_ssid), session.remote_callsign, data)
+            ax25_frame = build_ax25_frame(self._local_callsign, session.remote_callsign, data)
             kiss_frame = kiss_wrap(ax25_frame)
             
-            socketio_logger.info(f"[CONTROL] Sending via VARA ({len(data)} bytes)")
+            socketio_logger.info("[CONTROL] Sending via VARA (%d bytes)", len(data))
             session.data_socket.sendall(kiss_frame)
             session.update_activity()
             self._last_buffer_change_time = time.time()
@@ -430,55 +465,50 @@ class VARABackend(NetworkBackend):
     def receive_data(self, session: VARASession, timeout: int = 30) -> Optional[bytes]:
         try:
             if not session or not session.connected: return None
-            session_key = f"{session.remote_callsign[0]}-{session.remote_callsign[1]}"
-            
-            if not hasattr(self, '_receive_buffers'): self._receive_buffers = {}
-            if not hasattr(self, '_json_buffers'): self._json_buffers = {}
-            if session_key not in self._receive_buffers:
-                self._receive_buffers[session_key] = b''
-                self._json_buffers[session_key] = b''
-            
-            buffer = self._receive_buffers[session_key]
-            json_buffer = self._json_buffers[session_key]
+            buffer = session.receive_buffer
+            json_buffer = session.json_buffer
             
             last_activity_time = time.time()
-            logging.debug(f"[VARA_BACKEND] Starting receive (Idle Timeout: {timeout}s)")
+            logging.debug("[VARA_BACKEND] Starting receive (Idle Timeout: %ss)", timeout)
             
             while time.time() - last_activity_time < timeout:
                 try:
-                    session.data_socket.settimeout(1.0)
-                    chunk = session.data_socket.recv(1024)
-                    if not chunk:
+                    if not session.selector.select(timeout=1.0):
+                        if not session.is_active():
+                            session.connected = False
+                            return None
+                        continue
+                    received = session.data_socket.recv_into(session.recv_view)
+                    if not received:
                         session.connected = False
-                        del self._receive_buffers[session_key]
-                        del self._json_buffers[session_key]
+                        buffer.clear()
+                        json_buffer.clear()
                         return None
                     
                     last_activity_time = time.time()
-                    buffer += chunk
-                    socketio_logger.info(f"[PACKET] Receiving data via VARA...")
+                    buffer += session.recv_view[:received]
+                    socketio_logger.info("[PACKET] Receiving data via VARA...")
                     
-                    while b'\xc0' in buffer:
+                    while True:
                         fend_start = buffer.find(b'\xc0')
+                        if fend_start == -1: break
                         fend_end = buffer.find(b'\xc0', fend_start + 1)
                         if fend_end == -1: break
                         
-                        kiss_frame = buffer[fend_start:fend_end + 1]
-                        buffer = buffer[fend_end + 1:]
+                        kiss_frame = bytes(buffer[fend_start:fend_end + 1])
+                        del buffer[:fend_end + 1]
                         ax25_frame = kiss_unwrap(kiss_frame)
                         
                         if ax25_frame and len(ax25_frame) > 17:
-                            payload = ax25_frame[17:]
-                            json_buffer += payload
+                            json_buffer += memoryview(ax25_frame)[17:]
                             try:
-                                json_str = json_buffer.decode('utf-8')
-                                import json as json_module
-                                json_module.loads(json_str)
+                                json.loads(json_buffer.decode('utf-8'))
                                 session.update_activity()
-                                socketio_logger.info(f"[PACKET] Received complete message ({len(json_buffer)} bytes)")
-                                self._receive_buffers[session_key] = b''
-                                self._json_buffers[session_key] = b''
-                                return json_buffer
+                                socketio_logger.info("[PACKET] Received complete message (%d bytes)", len(json_buffer))
+                                message = bytes(json_buffer)
+                                buffer.clear()
+                                json_buffer.clear()
+                                return message
                             except: continue
                 except socket.timeout:
                     if not session.is_active():
@@ -486,8 +516,6 @@ class VARABackend(NetworkBackend):
                         return None
                     continue
             
-            self._receive_buffers[session_key] = buffer
-            self._json_buffers[session_key] = json_buffer
             return None
         except Exception as e:
             logging.error(f"[VARA_BACKEND] Receive error: {e}")
@@ -543,7 +571,7 @@ class VARABackend(NetworkBackend):
     def _check_disconnection(self, session) -> bool:
         with self._message_lock:
             for msg in self._vara_messages:
-                if "DISCONNECTED" in msg: return True
+                if b"DISCONNECTED" in msg: return True
         return False
         
     def _restart_vara_listening(self):
@@ -566,6 +594,8 @@ class VARABackend(NetworkBackend):
                 except: pass
             
             if session.data_socket:
+                try: session.selector.close()
+                except: pass
                 try: session.data_socket.close()
                 except: pass
             
@@ -147,7 +147,9 @@ def receive_packet(sock, timeout=0.1):
     try:
         # Set timeout and receive data
         if hasattr(sock, 'settimeout'):  # TCP socket
-            sock.settimeout(timeout)
+            # Only hit setsockopt when the caller's timeout actually changes
+            if sock.gettimeout() != timeout:
+                sock.settimeout(timeout)
             chunk = sock.recv(1024)
         elif hasattr(sock, 'timeout'):  # Serial connection
             sock.timeout = timeout
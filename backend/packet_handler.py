@@ -10,6 +10,15 @@ from socketio_logger import get_socketio_logger
 # SocketIO logger
 socketio_logger = get_socketio_logger()
 
+# Control message types and their pre-encoded "<type>:" wire prefixes
+CONTROL_MESSAGE_TYPES = frozenset([
+    MessageType.ACK, MessageType.CONNECT, MessageType.CONNECT_ACK,
+    MessageType.DATA_REQUEST, MessageType.DONE, MessageType.DONE_ACK,
+    MessageType.RETRY, MessageType.DISCONNECT, MessageType.READY,
+    MessageType.PKT_MISSING,
+])
+CONTROL_PREFIXES = {message_type: f"{message_type.value}:".encode() for message_type in CONTROL_MESSAGE_TYPES}
+
 class PacketHandler:
     def __init__(self, core):
         self.core = core
@@ -20,24 +29,21 @@ class PacketHandler:
             logging.error("TNC connection is closed. Cannot send packet.")
             return False
         
-        if message_type in [MessageType.ACK, MessageType.CONNECT, MessageType.CONNECT_ACK, 
-                            MessageType.DATA_REQUEST, MessageType.DONE, MessageType.DONE_ACK, 
-                            MessageType.RETRY, MessageType.DISCONNECT, MessageType.READY,
-                            MessageType.PKT_MISSING]:
+        if message_type in CONTROL_MESSAGE_TYPES:
             # Control messages
-            full_packet = f"{message_type.value}:{packet.decode()}"
+            full_packet = CONTROL_PREFIXES[message_type] + packet
         else:
             # Data messages
-            header = f"{seq_num:04d}|{total_packets:04d}|{message_type.value}"
-            content = f"{header}:{packet.decode()}"
+            content = f"{seq_num:04d}|{total_packets:04d}|{message_type.value}:".encode() + packet
             
             # Calculate checksum and append it to the content
-            checksum = calculate_crc32(content.encode())
-            full_packet = f"{content}|{checksum}"
+            checksum = calculate_crc32(content)
+            full_packet = content + b"|" + checksum.encode()
 
-        logging.debug(f"Sending packet: {full_packet}")
+        if logging.getLogger().isEnabledFor(logging.DEBUG):
+            logging.debug(f"Sending packet: {full_packet.decode(errors='replace')}")
         
-        ax25_frame = build_ax25_frame(self.core.callsign, session.remote_callsign, full_packet.encode())
+        ax25_frame = build_ax25_frame(self.core.callsign, session.remote_callsign, full_packet)
         kiss_frame = kiss_wrap(ax25_frame)
         
         # Add PTT TX delay for radio to engage PTT
@@ -20,6 +20,13 @@ def parse_callsign(callsign):
     else:
         raise ValueError(f"Invalid callsign format: {callsign}")
 
+def parse_ack_seq(message):
+    """Return the sequence number part of an ACK payload ("ACK|<seq>"), or None."""
+    if not message:
+        return None
+    _, sep, seq_num = message.partition("|")
+    return seq_num if sep else None
+
 def estimate_transmission_time(packet_size):
     """Estimate the transmission time for a packet."""
     # Assuming 10 bits per byte (8 data bits + start bit + stop bit)
@@ -27,6 +34,17 @@ def estimate_transmission_time(packet_size):
     transmission_time = bits_to_send / config.BAUD_RATE
     return transmission_time + config.PACKET_SEND_DELAY  # Add the configured delay
 
+def compress_nostr_bytes(data):
+    """
+    Compress already-encoded NOSTR JSON bytes using brotli and encode to base64 string.
+    Args:
+        data: UTF-8 encoded JSON bytes
+    Returns:
+        Base64 encoded string of compressed data
+    """
+    compressed = brotli.compress(data, mode=brotli.MODE_TEXT)
+    return base64.b64encode(compressed).decode('ascii')
+
 def compress_nostr_data(data):
     """
     Compress NOSTR data using brotli and encode to base64 string.
@@ -37,8 +55,7 @@ def compress_nostr_data(data):
     """
     if isinstance(data, str):
         data = data.encode('utf-8')
-    compressed = brotli.compress(data)
-    return base64.b64encode(compressed).decode('utf-8')
+    return compress_nostr_bytes(data)
 
 def decompress_nostr_data(encoded_data):
     """
@@ -55,7 +55,8 @@ class Server:
 
         def debug_thread():
             while self.running:
-                logging.debug(f"Server still running. Active threads: {threading.active_count()}")
+                if logging.getLogger().isEnabledFor(logging.DEBUG):
+                    logging.debug("Server still running. Active threads: %d", threading.active_count())
                 time.sleep(5)
 
         threading.Thread(target=debug_thread, daemon=True).start()
@@ -1,4 +1,7 @@
 import logging
+import atexit
+import queue
+from logging.handlers import QueueHandler, QueueListener
 from flask_socketio import SocketIO
 import json
 from datetime import datetime
@@ -6,6 +9,11 @@ from datetime import datetime
 socketio = None
 flask_app = None
 
+# Log records are queued and emitted to the frontend from a background listener
+# thread, so radio code never blocks on a SocketIO emit between protocol steps
+_log_queue = queue.Queue(-1)
+_log_listener = None
+
 class SocketIOHandler(logging.Handler):
     def emit(self, record):
         global socketio, flask_app
@@ -16,7 +24,7 @@ class SocketIOHandler(logging.Handler):
                 'module': record.module,
                 'timestamp': datetime.fromtimestamp(record.created).strftime('%Y-%m-%d %H:%M:%S')
             }
-            # Force immediate emission - don't use threads, just emit directly
+            # Runs on the queue listener thread, so emitting here never blocks the caller
             try:
                 socketio.emit('log', json.dumps(log_entry), namespace='/')
             except Exception as e:
@@ -30,10 +38,19 @@ def init_socketio(app):
     flask_app = app
     return socketio
 
+def _start_log_listener():
+    global _log_listener
+    if _log_listener is None:
+        _log_listener = QueueListener(_log_queue, SocketIOHandler(), respect_handler_level=True)
+        _log_listener.start()
+        # Flush anything still queued on shutdown
+        atexit.register(_log_listener.stop)
+
 def get_socketio_logger(name='socketio_logger'):
     logger = logging.getLogger(name)
     if not logger.handlers:
-        logger.addHandler(SocketIOHandler())
+        _start_log_listener()
+        logger.addHandler(QueueHandler(_log_queue))
         logger.setLevel(logging.INFO)
         logger.propagate = False
     return logger
\ No newline at end of file
@@ -1,38 +1,135 @@
 import config
 import threading
+import queue
+import collections
 import sqlite3
 import json
+import base64
 import time
 import uuid
 import os
+import sys
 import logging
 import importlib
 import platform
 import glob
+import mimetypes
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from contextlib import contextmanager
+from functools import lru_cache
+from pathlib import Path
 from models import NoteRequestType, NoteType, MessageType, ZapType
-from protocol_utils import compress_nostr_data, decompress_nostr_data, parse_callsign
+from protocol_utils import compress_nostr_data, compress_nostr_bytes, decompress_nostr_data, parse_callsign
 from socketio_logger import init_socketio, get_socketio_logger
 from nostr_sdk import Keys, EventId, EventBuilder, Tag, Kind 
 from nsec_storage import NSECStorage
 from nwc_storage import NWCStorage
 from datetime import datetime
 from flask import Flask, request, jsonify, send_from_directory, send_file
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
 from client import Client
 
+# NWC payment command builder; nostr.py also pulls in relay client dependencies
+# (aiohttp, requests) that a client-only install may not have
+try:
+    from nostr import create_nwc_payment_command
+    NWC_PAYMENTS_AVAILABLE = True
+except ImportError as e:
+    NWC_PAYMENTS_AVAILABLE = False
+    logging.warning(f"nostr module not available - zaps cannot create NWC payments: {e}")
+
+# Import orjson support
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+    logging.warning("orjson not available - using standard json for API payloads")
+
+
+class ORJSONProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by orjson for jsonify() and request.get_json()."""
+    def dumps(self, obj, **kwargs):
+        option = orjson.OPT_SORT_KEYS if kwargs.get('sort_keys', self.sort_keys) else 0
+        return orjson.dumps(obj, default=self.default, option=option).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
 
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 FRONTEND_DIR = os.path.join(os.path.dirname(BASE_DIR), 'frontend', 'build')
+DB_PATH = os.path.join(BASE_DIR, 'data', 'notes.db')
 
 app = Flask(__name__, static_folder=FRONTEND_DIR)
+if ORJSON_AVAILABLE:
+    app.json = ORJSONProvider(app)
+# Key order doesn't matter to the frontend; skip sorting every response
+app.json.sort_keys = False
 CORS(app, resources={r"/*": {"origins": "*"}}, supports_credentials=True)
 socketio = init_socketio(app)
 nsec_storage = NSECStorage(BASE_DIR)
 nwc_storage = NWCStorage(BASE_DIR)
 
-#initiate radio process lock
-radio_lock = threading.Lock()
-radio_operation_in_progress = False
+# Event kinds used when building notes (constructed once, not per request)
+KIND_TEXT_NOTE = Kind(1)
+KIND_REPOST = Kind(6)
+KIND_ZAP_REQUEST = Kind(9734)
+
+# Publishing relays added to every zap request; the tag never changes, so parse it once
+ZAP_PUBLISH_RELAYS_TAG = Tag.parse(["relays", "wss://nos.lol", "wss://relay.damus.io"])
+
+# Parsed signing keys, reused until the stored NSEC changes
+_keys_cache = {"nsec": None, "keys": None, "pubkey_hex": None}
+_keys_cache_lock = threading.Lock()
+
+def get_signing_keys(nsec):
+    """Return (Keys, hex pubkey) for an NSEC, parsing it only when it changes."""
+    with _keys_cache_lock:
+        if _keys_cache["nsec"] != nsec:
+            keys = Keys.parse(nsec)
+            _keys_cache.update(nsec=nsec, keys=keys, pubkey_hex=keys.public_key().to_hex())
+        return _keys_cache["keys"], _keys_cache["pubkey_hex"]
+
+def clear_signing_keys():
+    with _keys_cache_lock:
+        _keys_cache.update(nsec=None, keys=None, pubkey_hex=None)
+
+# Upper bound for JSON request bodies accepted by the API
+MAX_JSON_BODY_BYTES = 1 << 20
+
+def parse_json_body(req, max_bytes=MAX_JSON_BODY_BYTES):
+    """Parse a JSON request body straight from the raw bytes; raises ValueError if too large or malformed."""
+    if req.content_length is not None and req.content_length > max_bytes:
+        raise ValueError("payload too large")
+    # Read one byte past the cap so a body sent without Content-Length is never buffered whole
+    data = req.stream.read(max_bytes + 1)
+    if len(data) > max_bytes:
+        raise ValueError("payload too large")
+    return app.json.loads(data)
+
+# Target server callsign, parsed once per config load instead of per radio operation
+SERVER_CALLSIGN = parse_callsign(config.HAMSTR_SERVER)
+
+# Single long-lived radio worker; TNC operations are queued and run one at a time
+radio_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="radio")
+_radio_future = None
+_radio_submit_lock = threading.Lock()
+
+def submit_radio_task(fn):
+    """Start a TNC operation on the radio worker; returns None if one is already in flight."""
+    global _radio_future
+    with _radio_submit_lock:
+        if radio_busy():
+            return None
+        _radio_future = radio_executor.submit(fn)
+        return _radio_future
+
+def radio_busy():
+    """True while a radio operation is queued or running."""
+    future = _radio_future
+    return future is not None and not future.done()
 
 
 # Initialize Client()
@@ -46,11 +143,13 @@ socketio_logger = get_socketio_logger()
 # Setup db init on app startup
 
 def init_db():
-    db_path = os.path.join(BASE_DIR, 'data', 'notes.db')
-    os.makedirs(os.path.dirname(db_path), exist_ok=True)
-    conn = sqlite3.connect(db_path)
+    os.makedirs(os.path.dirname(DB_PATH), exist_ok=True)
+    conn = sqlite3.connect(DB_PATH)
     c = conn.cursor()
     try:
+        # WAL lets the feed readers keep going while notes are being written (persists in the db file)
+        c.execute("PRAGMA journal_mode=WAL")
+        
         # First check if table exists and get current columns
         c.execute("PRAGMA table_info(notes)")
         existing_columns = {row[1] for row in c.fetchall()}
@@ -83,6 +182,16 @@ def init_db():
                 except Exception as col_error:
                     socketio_logger.error(f"[DATABASE] Error adding column {column_name}: {col_error}")
         
+        # Feed index so cursor pagination seeks straight to the next page
+        c.execute("CREATE INDEX IF NOT EXISTS idx_notes_feed ON notes(is_local, created_at DESC, id DESC)")
+        
+        # Planner statistics: full ANALYZE the first time, then let SQLite refresh them as needed
+        c.execute("SELECT 1 FROM sqlite_master WHERE name = 'sqlite_stat1'")
+        if c.fetchone() is None:
+            c.execute("ANALYZE")
+        else:
+            c.execute("PRAGMA optimize")
+        
         conn.commit()
         socketio_logger.info("[DATABASE] Database initialization completed successfully")
     except Exception as e:
@@ -93,13 +202,111 @@ def init_db():
 # Call the initialize database function at startup!!
 init_db()
 
+# Database connection pool - one shared writer plus a few read-only readers,
+# opened once at startup instead of on every request
+DB_READER_COUNT = 4
+DB_STATEMENT_CACHE_SIZE = 256
+_db_writer = None
+_db_writer_lock = threading.Lock()
+_db_readers = queue.Queue()
+
+# SQL text kept at module scope so sqlite3's per-connection statement cache is reused.
+# Interaction columns are guaranteed by init_db, so the feed column list is fixed.
+NOTES_FEED_COLUMNS = "id, content, created_at, pubkey, display_name, lud16, is_local, zapped, zap_amount, replied, boosted, quoted"
+NOTES_FEED_PAGE_SQL = f"""
+    SELECT {NOTES_FEED_COLUMNS}
+    FROM notes 
+    WHERE is_local = 0 
+    ORDER BY created_at DESC, id DESC 
+    LIMIT ? OFFSET ?
+"""
+NOTES_FEED_CURSOR_SQL = f"""
+    SELECT {NOTES_FEED_COLUMNS}
+    FROM notes 
+    WHERE is_local = 0 AND (created_at, id) < (?, ?)
+    ORDER BY created_at DESC, id DESC 
+    LIMIT ?
+"""
+INSERT_RECEIVED_NOTE_SQL = """INSERT OR REPLACE INTO notes 
+    (id, content, created_at, pubkey, display_name, lud16, is_local, stored_at) 
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)"""
+INSERT_LOCAL_NOTE_SQL = """INSERT INTO notes 
+    (id, content, created_at, pubkey, referenced_events, p, root, is_local) 
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)"""
+INTERACTION_UPDATE_SQL = {
+    interaction: f"UPDATE notes SET {interaction} = 1 WHERE id = ?"
+    for interaction in ('zapped', 'replied', 'boosted', 'quoted')
+}
+ZAP_AMOUNT_UPDATE_SQL = "UPDATE notes SET zapped = 1, zap_amount = COALESCE(zap_amount, 0) + ? WHERE id = ?"
+CLEAR_NOTES_SQL = "DELETE FROM notes"
+
+@lru_cache(maxsize=64)
+def existing_note_ids_sql(count):
+    """SELECT for which of `count` note ids are already stored; one identical string per batch size."""
+    return f"SELECT id FROM notes WHERE id IN ({','.join('?' * count)})"
+
+
+# Memory-mapped reads serve pages straight from the OS page cache; keep the
+# mapping small on 32-bit interpreters where address space is tight
+DB_MMAP_SIZE = 268435456 if sys.maxsize > 2**32 else 67108864
+
+# Per-connection tuning; WAL makes synchronous=NORMAL safe against corruption
+DB_CONNECTION_PRAGMAS = (
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-20000",
+    f"PRAGMA mmap_size={DB_MMAP_SIZE}",
+    "PRAGMA busy_timeout=5000",
+)
+
+def _open_db_connection(db_path, read_only=False):
+    if read_only:
+        conn = sqlite3.connect(f"{Path(db_path).as_uri()}?mode=ro", uri=True, check_same_thread=False,
+                               cached_statements=DB_STATEMENT_CACHE_SIZE)
+        conn.row_factory = sqlite3.Row
+    else:
+        # IMMEDIATE takes the write lock when the implicit transaction begins, so a batch
+        # never has to upgrade from a read lock part way through
+        conn = sqlite3.connect(db_path, check_same_thread=False, cached_statements=DB_STATEMENT_CACHE_SIZE,
+                               isolation_level="IMMEDIATE")
+    for pragma in DB_CONNECTION_PRAGMAS:
+        conn.execute(pragma)
+    return conn
+
+def init_db_pool():
+    global _db_writer
+    _db_writer = _open_db_connection(DB_PATH)
+    for _ in range(DB_READER_COUNT):
+        _db_readers.put(_open_db_connection(DB_PATH, read_only=True))
+
+@contextmanager
+def db_reader():
+    """Borrow a read-only connection from the pool."""
+    conn = _db_readers.get()
+    try:
+        yield conn
+    finally:
+        _db_readers.put(conn)
+
+@contextmanager
+def db_writer():
+    """Hold the shared writer connection; anything left uncommitted is rolled back on exit."""
+    with _db_writer_lock:
+        try:
+            yield _db_writer
+        finally:
+            if _db_writer.in_transaction:
+                _db_writer.rollback()
+
+init_db_pool()
+
 
 # API Routes
 @app.route('/api/notes/<note_id>/interaction', methods=['POST'])
 def update_note_interaction(note_id):
     """Update interaction status for a note (zapped, replied, boosted, quoted)"""
     try:
-        data = request.get_json()
+        data = parse_json_body(request)
         interaction_type = data.get('type')  # 'zapped', 'replied', 'boosted', 'quoted'
         zap_amount = data.get('amount', 0)  # NEW: Get zap amount if provided
         
@@ -109,29 +316,26 @@ def update_note_interaction(note_id):
                 "message": "Invalid interaction type"
             }), 400
         
-        db_path = os.path.join(BASE_DIR, 'data', 'notes.db')
-        conn = sqlite3.connect(db_path)
-        c = conn.cursor()
-        
-        # Update the specific interaction column
-        if interaction_type == 'zapped' and zap_amount > 0:
-            # For zaps, increment the zap_amount (running total)
-            c.execute(f"UPDATE notes SET {interaction_type} = 1, zap_amount = COALESCE(zap_amount, 0) + ? WHERE id = ?", 
-                    (zap_amount, note_id))
-            socketio_logger.info(f"[DATABASE] Added {zap_amount} sats to note {note_id}, new total in zap_amount column")
-        else:
-            # For other interactions, just set the flag
-            c.execute(f"UPDATE notes SET {interaction_type} = 1 WHERE id = ?", (note_id,))
-        
-        if c.rowcount == 0:
-            conn.close()
-            return jsonify({
-                "success": False,
-                "message": "Note not found"
-            }), 404
-        
-        conn.commit()
-        conn.close()
+        with db_writer() as conn:
+            c = conn.cursor()
+            
+            # Update the specific interaction column
+            if interaction_type == 'zapped' and zap_amount > 0:
+                # For zaps, increment the zap_amount (running total)
+                c.execute(ZAP_AMOUNT_UPDATE_SQL, (zap_amount, note_id))
+                socketio_logger.info(f"[DATABASE] Added {zap_amount} sats to note {note_id}, new total in zap_amount column")
+            else:
+                # For other interactions, just set the flag
+                c.execute(INTERACTION_UPDATE_SQL[interaction_type], (note_id,))
+            
+            if c.rowcount == 0:
+                conn.rollback()
+                return jsonify({
+                    "success": False,
+                    "message": "Note not found"
+                }), 404
+            
+            conn.commit()
         
         socketio_logger.info(f"[DATABASE] Updated {interaction_type} status for note {note_id}")
         
@@ -151,113 +355,84 @@ def update_note_interaction(note_id):
 def get_notes():
     page = request.args.get('page', 1, type=int)
     limit = request.args.get('limit', 10, type=int)
-    notes = get_notes_from_db(page, limit)
-    response = jsonify(notes)
-    # socketio_logger.info(f"[API] Returning notes response.")
-    return response
+    cursor = request.args.get('cursor')
+    if cursor:
+        try:
+            cursor = decode_notes_cursor(cursor)
+        except ValueError:
+            return jsonify({
+                "success": False,
+                "message": "Invalid cursor"
+            }), 400
+    notes = get_notes_from_db(page, limit, cursor)
+    logger.debug("Returning notes page=%s limit=%s count=%d", page, limit, len(notes["notes"]))
+    return jsonify(notes)
 
 
-def get_notes_from_db(page=1, limit=10):
-    offset = (page - 1) * limit
-    db_path = os.path.join(BASE_DIR, 'data', 'notes.db')
-    conn = sqlite3.connect(db_path)
-    c = conn.cursor()
-    
+def encode_notes_cursor(created_at, note_id):
+    """Serialize a (created_at, id) feed position for the client."""
+    return base64.urlsafe_b64encode(json.dumps([created_at, note_id]).encode()).decode()
+
+def decode_notes_cursor(cursor):
+    """Parse a cursor from encode_notes_cursor; raises ValueError if malformed."""
     try:
-        # First get total count
-        c.execute("SELECT COUNT(*) FROM notes WHERE is_local = 0")
-        total_count = c.fetchone()[0]
-        
-        # Check which columns exist in the database
-        c.execute("PRAGMA table_info(notes)")
-        existing_columns = {row[1] for row in c.fetchall()}
-        
-        # Build query based on available columns
-        base_columns = "id, content, created_at, pubkey, display_name, lud16, is_local"
-        interaction_columns = []
-        
-        if 'zapped' in existing_columns:
-            interaction_columns.append('zapped')
-        if 'zap_amount' in existing_columns:  # NEW: Check for zap_amount
-            interaction_columns.append('zap_amount')
-        if 'replied' in existing_columns:
-            interaction_columns.append('replied')
-        if 'boosted' in existing_columns:
-            interaction_columns.append('boosted')
-        if 'quoted' in existing_columns:
-            interaction_columns.append('quoted')
-        
-        if interaction_columns:
-            columns = base_columns + ", " + ", ".join(interaction_columns)
-        else:
-            columns = base_columns
-              
-        # Execute query with available columns
-        c.execute(f"""
-            SELECT {columns}
-            FROM notes 
-            WHERE is_local = 0 
-            ORDER BY created_at DESC 
-            LIMIT ? OFFSET ?
-        """, (limit, offset))
-        
-        notes = []
-        for row in c.fetchall():
-            # Base columns are always at indices 0-6
-            note_dict = {
-                "id": row[0],
-                "content": row[1],
-                "created_at": row[2],
-                "pubkey": row[3],
-                "display_name": row[4],
-                "lud16": row[5],
-                "is_local": row[6]
+        created_at, note_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (TypeError, ValueError, UnicodeError) as e:
+        raise ValueError(f"Invalid notes cursor: {cursor}") from e
+    return created_at, note_id
+
+def get_notes_from_db(page=1, limit=10, cursor=None):
+    """Fetch a page of feed notes, by page number or by keyset cursor (created_at, id)."""
+    # SQLite treats a negative LIMIT as "no limit", so never let one through
+    if limit <= 0:
+        return {
+            "notes": [],
+            "pagination": {
+                "page": page,
+                "limit": limit,
+                "has_more": False,
+                "next_cursor": None
             }
-            
-            # Dynamically assign interaction columns based on their position
-            col_index = 7
-            if 'zapped' in existing_columns:
-                note_dict["zapped"] = bool(row[col_index]) if len(row) > col_index else False
-                col_index += 1
-            else:
-                note_dict["zapped"] = False
-            
-            # NEW: Handle zap_amount
-            if 'zap_amount' in existing_columns:
-                note_dict["zap_amount"] = row[col_index] if len(row) > col_index else 0
-                col_index += 1
-            else:
-                note_dict["zap_amount"] = 0
-            
-            if 'replied' in existing_columns:
-                note_dict["replied"] = bool(row[col_index]) if len(row) > col_index else False
-                col_index += 1
-            else:
-                note_dict["replied"] = False
-            
-            if 'boosted' in existing_columns:
-                note_dict["boosted"] = bool(row[col_index]) if len(row) > col_index else False
-                col_index += 1
-            else:
-                note_dict["boosted"] = False
-            
-            if 'quoted' in existing_columns:
-                note_dict["quoted"] = bool(row[col_index]) if len(row) > col_index else False
-                col_index += 1
+        }
+    offset = max(page - 1, 0) * limit
+    
+    try:
+        with db_reader() as conn:
+            # A cursor seeks past the last row seen instead of scanning and discarding OFFSET rows
+            if cursor:
+                c = conn.execute(NOTES_FEED_CURSOR_SQL, (cursor[0], cursor[1], limit + 1))
             else:
-                note_dict["quoted"] = False
+                c = conn.execute(NOTES_FEED_PAGE_SQL, (limit + 1, offset))
             
-            notes.append(note_dict)
-                
-        has_more = (offset + limit) < total_count
+            # Build the page straight off the cursor (rows are sqlite3.Row)
+            notes = [{
+                "id": row["id"],
+                "content": row["content"],
+                "created_at": row["created_at"],
+                "pubkey": row["pubkey"],
+                "display_name": row["display_name"],
+                "lud16": row["lud16"],
+                "is_local": row["is_local"],
+                "zapped": bool(row["zapped"]),
+                "zap_amount": row["zap_amount"] or 0,
+                "replied": bool(row["replied"]),
+                "boosted": bool(row["boosted"]),
+                "quoted": bool(row["quoted"])
+            } for row in c]
+        
+        # One extra row is fetched as a lookahead for has_more instead of a COUNT(*)
+        has_more = len(notes) > limit
+        if has_more:
+            notes.pop()
+        next_cursor = encode_notes_cursor(notes[-1]["created_at"], notes[-1]["id"]) if notes else None
         
         return {
             "notes": notes,
             "pagination": {
                 "page": page,
                 "limit": limit,
-                "total": total_count,
-                "has_more": has_more
+                "has_more": has_more,
+                "next_cursor": next_cursor
             }
         }
         
@@ -269,25 +444,58 @@ def get_notes_from_db(page=1, limit=10):
             "pagination": {
                 "page": page,
                 "limit": limit,
-                "total": 0,
-                "has_more": False
+                "has_more": False,
+                "next_cursor": None
             }
         }
-    finally:
-        conn.close()
 
-def check_radio_status(operation_type):
-    global radio_operation_in_progress
-    if radio_operation_in_progress:
-        socketio_logger.error(f"[CLIENT] Failed to {operation_type} - radio operation in progress")
-        return True
-    return False
+def emit_note_status(job_id, future):
+    """Report the outcome of a queued (async) note send to the frontend."""
+    try:
+        if future.result():
+            status = {"job_id": job_id, "success": True, "message": "Note sent successfully"}
+        else:
+            status = {"job_id": job_id, "success": False,
+                      "message": f"Unable to connect to {config.HAMSTR_SERVER[0]}-{config.HAMSTR_SERVER[1]}"}
+    except Exception as e:
+        socketio_logger.error(f"[CLIENT] Hardware/Protocol error: {str(e)}")
+        status = {"job_id": job_id, "success": False, "message": str(e)}
+    socketio.emit('note_status', status)
+
+class NoteRequestError(ValueError):
+    """Invalid send_note payload; reported to the client as a 400."""
+
+def _reply_tags(data):
+    if 'reply_to' not in data or 'reply_pubkey' not in data:
+        raise NoteRequestError("Reply requires note ID and author's pubkey")
+    # e-tag with NIP-10 reply marker and p-tag for the original note's author
+    return KIND_TEXT_NOTE, (Tag.parse(["e", data['reply_to'], "", "reply"]),
+                            Tag.parse(["p", data['reply_pubkey']]))
+
+def _quote_tags(data):
+    if 'reply_to' not in data or 'reply_pubkey' not in data:
+        raise NoteRequestError("Quote requires note ID and author's pubkey")
+    # For quotes, add the original note as a mention, not a reply, plus the author's p-tag
+    return KIND_TEXT_NOTE, (Tag.parse(["e", data['reply_to'], "", "mention"]),
+                            Tag.parse(["p", data['reply_pubkey']]))
+
+def _repost_tags(data):
+    if 'repost_id' not in data or 'reply_pubkey' not in data:
+        raise NoteRequestError("Repost requires note ID and author's pubkey")
+    # Repost uses kind 6
+    return KIND_REPOST, (Tag.parse(["e", data['repost_id']]),
+                         Tag.parse(["p", data['reply_pubkey']]))
+
+# (kind, tags) builders for the non-standard note types
+NOTE_TAG_BUILDERS = {
+    NoteType.REPLY: _reply_tags,
+    NoteType.QUOTE: _quote_tags,
+    NoteType.REPOST: _repost_tags,
+}
 
 @app.route('/api/send_note', methods=['POST'])
 def send_note():
-    global radio_operation_in_progress
-    
-    if radio_operation_in_progress:
+    if radio_busy():
         socketio_logger.info("[SYSTEM] Cannot send note - radio operation in progress")
         return jsonify({
             "success": False, 
@@ -295,7 +503,7 @@ def send_note():
         }), 500
 
     try:
-        data = request.get_json()
+        data = parse_json_body(request)
         socketio_logger.info("[DEBUG] Parsed JSON data: %s", data)
     except Exception as e:
         socketio_logger.error("[DEBUG] JSON parse error: %s", str(e))
@@ -317,121 +525,69 @@ def send_note():
                 "message": "NSEC key not found. Please set up your NOSTR key first."
             }), 400
 
-        keys = Keys.parse(nsec)
+        keys, _ = get_signing_keys(nsec)
         
-        # Build tags
-        tags = []
-        for hashtag in hashtags:
-            tag = Tag.parse(["t", hashtag])
-            tags.append(tag)
+        # Build tags (each distinct hashtag parsed once, order kept)
+        tags = [Tag.parse(["t", hashtag]) for hashtag in dict.fromkeys(hashtags)]
         
-        # Handle different note types
-        if note_type == NoteType.REPLY:
-            if 'reply_to' not in data or 'reply_pubkey' not in data:
-                return jsonify({
-                    "success": False,
-                    "message": "Reply requires note ID and author's pubkey"
-                }), 400
-            
-            # Add e-tag with NIP-10 reply marker
-            e_tag = Tag.parse(["e", data['reply_to'], "", "reply"])
-            tags.append(e_tag)
-            
-            # Add p-tag for the original note's author
-            p_tag = Tag.parse(["p", data['reply_pubkey']])
-            tags.append(p_tag)
-            
-            builder = EventBuilder(
-                kind=Kind(1),
-                content=content,
-                tags=tags
-            )
-            
-        elif note_type == NoteType.QUOTE:
-            if 'reply_to' not in data or 'reply_pubkey' not in data:
-                return jsonify({
-                    "success": False,
-                    "message": "Quote requires note ID and author's pubkey"
-                }), 400
-            
-            # For quotes, add the original note as a mention, not a reply
-            e_tag = Tag.parse(["e", data['reply_to'], "", "mention"])
-            tags.append(e_tag)
-            
-            # Add p-tag for the original note's author
-            p_tag = Tag.parse(["p", data['reply_pubkey']])
-            tags.append(p_tag)
-            
-            builder = EventBuilder(
-                kind=Kind(1),
-                content=content,
-                tags=tags
-            )
-            
-        elif note_type == NoteType.REPOST:
-            if 'repost_id' not in data or 'reply_pubkey' not in data:
+        # Note-type specific tags and kind
+        build_tags = NOTE_TAG_BUILDERS.get(note_type)
+        if build_tags:
+            try:
+                kind, type_tags = build_tags(data)
+            except NoteRequestError as e:
                 return jsonify({
                     "success": False,
-                    "message": "Repost requires note ID and author's pubkey"
+                    "message": str(e)
                 }), 400
-            
-            # Repost uses kind 6
-            e_tag = Tag.parse(["e", data['repost_id']])
-            p_tag = Tag.parse(["p", data['reply_pubkey']])
-            tags.append(e_tag)
-            tags.append(p_tag)
-            
-            builder = EventBuilder(
-                kind=Kind(6),
-                content=content,
-                tags=tags
-            )
-            
+            tags.extend(type_tags)
         else:
             # Standard note
-            builder = EventBuilder(
-                kind=Kind(1),
-                content=content,
-                tags=tags
-            )
+            kind = KIND_TEXT_NOTE
+        
+        builder = EventBuilder(
+            kind=kind,
+            content=content,
+            tags=tags
+        )
 
         signed_note = builder.to_event(keys)
-        note_json = signed_note.as_json()
-        
-        compressed_note = compress_nostr_data(note_json)
+        compressed_note = compress_nostr_bytes(signed_note.as_json().encode('utf-8'))
         socketio_logger.info("[CLIENT] Note compressed, preparing to send")
         
-        result_container = []
-        error_container = []
-        
-        def send_note_thread():
-            global radio_operation_in_progress
-            with radio_lock:
-                radio_operation_in_progress = True
-                try:
-                    success = client.connect_and_send_note(config.HAMSTR_SERVER, compressed_note)
-                    result_container.append(success)
-                except Exception as e:
-                    # Capture exception for hardware/protocol errors
-                    error_container.append(str(e))
-                    socketio_logger.error(f"[CLIENT] Exception during send: {str(e)}")
-                finally:
-                    radio_operation_in_progress = False
-
-        thread = threading.Thread(target=send_note_thread)
-        thread.start()
-        thread.join(timeout=config.CONNECTION_TIMEOUT)
+        def send_note_task():
+            return client.connect_and_send_note(config.HAMSTR_SERVER, compressed_note)
 
-        if thread.is_alive():
+        future = submit_radio_task(send_note_task)
+        if future is None:
+            socketio_logger.info("[SYSTEM] Cannot send note - radio operation in progress")
+            return jsonify({
+                "success": False, 
+                "message": "Cannot send note - radio operation in progress"
+            }), 500
+        
+        # ?async=1 returns immediately; the result is pushed as a 'note_status' Socket.IO event
+        if request.args.get('async') == '1':
+            job_id = uuid.uuid4().hex
+            future.add_done_callback(lambda done: emit_note_status(job_id, done))
+            return jsonify({
+                "success": True,
+                "job_id": job_id,
+                "message": "Note queued for sending"
+            }), 202
+        
+        try:
+            success = future.result(timeout=config.CONNECTION_TIMEOUT)
+        except FutureTimeoutError:
             socketio_logger.error("[CLIENT] Failed to send note - operation timed out")
             return jsonify({
                 "success": False, 
                 "message": "Failed to connect to TNC - operation timed out"
             }), 500
-
-        # Check for hardware/protocol errors (exceptions from backend)
-        if error_container:
-            error_msg = error_container[0]
+        except Exception as e:
+            # Hardware/protocol errors raised by the backend
+            error_msg = str(e)
+            socketio_logger.error(f"[CLIENT] Exception during send: {error_msg}")
             
             # Pass through the actual error message from the backend
             socketio_logger.error(f"[CLIENT] Hardware/Protocol error: {error_msg}")
@@ -440,7 +596,7 @@ def send_note():
                 "message": error_msg
             }), 500
 
-        if not result_container or not result_container[0]:
+        if not success:
             # Connection failed - remote station not responding
             socketio_logger.error(f"[CLIENT] Unable to connect to {config.HAMSTR_SERVER[0]}-{config.HAMSTR_SERVER[1]}")
             return jsonify({
@@ -460,24 +616,23 @@ def send_note():
             "message": f"Error processing note: {str(e)}"
         }), 500
 
+ALLOWED_REQUEST_TYPES = frozenset({
+    NoteRequestType.SPECIFIC_USER.value,
+    NoteRequestType.FOLLOWING.value,
+    NoteRequestType.GLOBAL.value,
+    NoteRequestType.SEARCH_TEXT.value,
+    NoteRequestType.SEARCH_HASHTAG.value,
+    NoteRequestType.SEARCH_USER.value
+})
+
 @app.route('/request_notes/<int:count>', methods=['POST'])
 def request_notes(count):
-    global radio_operation_in_progress
-    
-    if check_radio_status("request notes"):
+    if radio_busy():
+        socketio_logger.error("[CLIENT] Failed to request notes - radio operation in progress")
         return jsonify({
             "success": False, 
             "message": "Failed to request notes - radio operation in progress"
         }), 500
-        
-    ALLOWED_REQUEST_TYPES = {
-        NoteRequestType.SPECIFIC_USER.value,
-        NoteRequestType.FOLLOWING.value,
-        NoteRequestType.GLOBAL.value,
-        NoteRequestType.SEARCH_TEXT.value,
-        NoteRequestType.SEARCH_HASHTAG.value,
-        NoteRequestType.SEARCH_USER.value
-    }
 
     try:
         nsec = nsec_storage.get_nsec()
@@ -489,7 +644,7 @@ def request_notes(count):
             }), 500
 
         # Use camelCase keys as the frontend sends
-        request_data = request.get_json()
+        request_data = parse_json_body(request)
         request_type_value = request_data.get('requestType')
         search_text = request_data.get('searchText', '')
         
@@ -503,8 +658,7 @@ def request_notes(count):
         request_type = NoteRequestType(request_type_value)
         
         # Determine additional parameters based on request type
-        keys = Keys.parse(nsec)
-        own_pubkey = keys.public_key().to_hex()
+        _, own_pubkey = get_signing_keys(nsec)
         
         if request_type == NoteRequestType.SPECIFIC_USER:
             additional_params = own_pubkey
@@ -526,54 +680,37 @@ def request_notes(count):
         per_note_timeout = 5  # 5 seconds per note
         dynamic_timeout = base_timeout + (count * per_note_timeout)
         
-        # Store original timeout to restore later
-        original_timeout = config.CONNECTION_TIMEOUT
-        # Temporarily override the timeout
-        config.CONNECTION_TIMEOUT = dynamic_timeout
-        
         socketio_logger.info(f"[SYSTEM] Using extended timeout of {dynamic_timeout} seconds for {count} notes")
         
-        result_container = []
-        error_container = []
-        
-        def request_notes_thread():
-            global radio_operation_in_progress
-            with radio_lock:
-                radio_operation_in_progress = True
-                try:
-                    success, response = client.connect_and_send_request(
-                        config.HAMSTR_SERVER, 
-                        request_type,
-                        count,
-                        additional_params=additional_params
-                    )
-                    result_container.append((success, response))
-                except Exception as e:
-                    # Capture exception for hardware/protocol errors
-                    error_container.append(str(e))
-                    socketio_logger.error(f"[CLIENT] Exception during request: {str(e)}")
-                finally:
-                    radio_operation_in_progress = False
-                    # Restore original timeout
-                    config.CONNECTION_TIMEOUT = original_timeout
-
-        thread = threading.Thread(target=request_notes_thread)
-        thread.start()
-        thread.join(timeout=dynamic_timeout + 30)
-
-        if thread.is_alive():
-            # Thread is still running after timeout
+        def request_notes_task():
+            return client.connect_and_send_request(
+                config.HAMSTR_SERVER, 
+                request_type,
+                count,
+                additional_params=additional_params,
+                timeout=dynamic_timeout
+            )
+
+        future = submit_radio_task(request_notes_task)
+        if future is None:
+            socketio_logger.error("[CLIENT] Failed to request notes - radio operation in progress")
+            return jsonify({
+                "success": False, 
+                "message": "Failed to request notes - radio operation in progress"
+            }), 500
+        try:
+            success, response = future.result(timeout=dynamic_timeout + 30)
+        except FutureTimeoutError:
+            # Radio worker is still running after timeout
             socketio_logger.error("[CLIENT] Request timeout - operation timed out")
-            config.CONNECTION_TIMEOUT = original_timeout
             return jsonify({
                 "success": False,
                 "message": "Failed to connect to TNC - operation timed out"
             }), 500
-
-        # Check for hardware/protocol errors (exceptions from backend)
-        if error_container:
-            error_msg = error_container[0]
-            config.CONNECTION_TIMEOUT = original_timeout
+        except Exception as e:
+            # Hardware/protocol errors raised by the backend
+            error_msg = str(e)
+            socketio_logger.error(f"[CLIENT] Exception during request: {error_msg}")
             
             # Pass through the actual error message from the backend
             socketio_logger.error(f"[CLIENT] Hardware/Protocol error: {error_msg}")
@@ -581,22 +718,10 @@ def request_notes(count):
                 "success": False,
                 "message": error_msg
             }), 500
-
-        if not result_container:
-            # No result at all - shouldn't happen but handle it
-            socketio_logger.error("[CLIENT] No result from connection attempt")
-            config.CONNECTION_TIMEOUT = original_timeout
-            return jsonify({
-                "success": False,
-                "message": "Connection failed"
-            }), 500
-
-        success, response = result_container[0]
         
         if not success:
             # Connection failed - remote station not responding (hardware worked but no response)
             socketio_logger.error(f"[CLIENT] Unable to connect to {config.HAMSTR_SERVER[0]}-{config.HAMSTR_SERVER[1]}")
-            config.CONNECTION_TIMEOUT = original_timeout
             
             # Return connection timeout error with callsign
             return jsonify({
@@ -608,7 +733,7 @@ def request_notes(count):
             try:
                 # Decompress the response
                 decompressed_response = decompress_nostr_data(response)
-                response_data = json.loads(decompressed_response)
+                response_data = app.json.loads(decompressed_response)
                 socketio_logger.info(f"[DEBUG] Parsed response data: {response_data.get('success')}")
                 
                 if not response_data.get('success', True):
@@ -649,9 +774,6 @@ def request_notes(count):
 
     except Exception as e:
         socketio_logger.error(f"[CLIENT] Error in request_notes: {str(e)}")
-        # Make sure to restore original timeout if there was an exception
-        if 'original_timeout' in locals():
-            config.CONNECTION_TIMEOUT = original_timeout
         return jsonify({
             "success": False,
             "message": f"Error: {str(e)}"
@@ -669,76 +791,73 @@ def create_note(content):
     }
 
 def save_note(note, is_local=False):
-    db_path = os.path.join(BASE_DIR, 'data', 'notes.db')
-    conn = sqlite3.connect(db_path)
-    c = conn.cursor()
     max_retries = 5
-    for _ in range(max_retries):
-        try:
-            c.execute("""INSERT INTO notes 
-                         (id, content, created_at, pubkey, referenced_events, p, root, is_local) 
-                         VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
-                      (note.get('id', str(uuid.uuid4())),
-                       note.get('content', ''),
-                       note.get('created_at', int(time.time())),
-                       note.get('pubkey', ''),
-                       json.dumps(note.get('referenced_events', [])),
-                       note.get('p', ''),
-                       note.get('root', ''),
-                       int(is_local)))
-            conn.commit()
-            break
-        except sqlite3.IntegrityError:
-            note['id'] = str(uuid.uuid4())  # Generate a new UUID and retry
-    else:
-        socketio_logger.error(f"Failed to save note after {max_retries} attempts")
-        logging.error(f"Failed to save note after {max_retries} attempts")
-    conn.close()
+    with db_writer() as conn:
+        c = conn.cursor()
+        for _ in range(max_retries):
+            try:
+                c.execute(INSERT_LOCAL_NOTE_SQL,
+                          (note.get('id', str(uuid.uuid4())),
+                           note.get('content', ''),
+                           note.get('created_at', int(time.time())),
+                           note.get('pubkey', ''),
+                           app.json.dumps(note.get('referenced_events', [])),
+                           note.get('p', ''),
+                           note.get('root', ''),
+                           int(is_local)))
+                conn.commit()
+                break
+            except sqlite3.IntegrityError:
+                note['id'] = str(uuid.uuid4())  # Generate a new UUID and retry
+        else:
+            socketio_logger.error(f"Failed to save note after {max_retries} attempts")
+            logging.error(f"Failed to save note after {max_retries} attempts")
 
 # Note Handinlg API
 def process_received_notes(response):
     try:
-        data = json.loads(response)
-        logging.debug(f"Parsed JSON data: {data}")
+        data = app.json.loads(response)
+        logger.debug("Parsed JSON data: %s", data)
         
         if isinstance(data, dict) and 'events' in data:
             notes = data['events']
         elif isinstance(data, list):
             notes = data
         else:
-            logging.error(f"Unexpected data structure: {data}")
+            logger.error("Unexpected data structure: %s", data)
             return
 
         base_timestamp = int(time.time())
-        db_path = os.path.join(BASE_DIR, 'data', 'notes.db')
-        conn = sqlite3.connect(db_path)
-        c = conn.cursor()
         
         try:
-            for i, note in enumerate(notes):
-                # Add a small increment (milliseconds) to each note's stored_at time
-                current_timestamp = base_timestamp + i
+            ids = [note.get('id') for note in notes]
+            
+            with db_writer() as conn:
+                # Notes we already have are skipped, so re-fetched events cost no writes
+                existing = {row[0] for row in conn.execute(existing_note_ids_sql(len(ids)), ids)}
                 
-                logging.debug(f"Processing note: {note}")
-                c.execute("""INSERT OR REPLACE INTO notes 
-                            (id, content, created_at, pubkey, display_name, lud16, is_local, stored_at) 
-                            VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
-                         (note.get('id'),
-                          note.get('content'),
-                          note.get('created_at'),
-                          note.get('pubkey', ''),
-                          note.get('display_name', ''),
-                          note.get('lud16', ''),
-                          0,  # 0 for not local
-                          current_timestamp))
-            conn.commit()
+                # Add a small increment to each note's stored_at time to keep arrival order
+                rows = [(note.get('id'),
+                         note.get('content'),
+                         note.get('created_at'),
+                         note.get('pubkey', ''),
+                         note.get('display_name', ''),
+                         note.get('lud16', ''),
+                         0,  # 0 for not local
+                         base_timestamp + i)
+                        for i, note in enumerate(notes)
+                        if note.get('id') not in existing]
+                
+                # One statement, one transaction for the new notes in the batch
+                if rows:
+                    conn.executemany(INSERT_RECEIVED_NOTE_SQL, rows)
+                    conn.commit()
+            logger.debug("Skipped %d already stored notes", len(notes) - len(rows))
             socketio_logger.info(f"[CLIENT] Processed {len(notes)} notes")
             logging.info(f"Processed {len(notes)} notes")
         except Exception as e:
             socketio_logger.error(f"[DATABASE] Error saving notes: {e}")
             logging.error(f"Error saving notes: {e}")
-        finally:
-            conn.close()
             
     except json.JSONDecodeError:
         socketio_logger.error("[SYSTEM] Error decoding received notes")
@@ -750,9 +869,113 @@ def process_received_notes(response):
 # Store section info dynamically
 setting_sections = {}
 
+# Parsed settings, rebuilt only when one of the settings files changes on disk
+SETTINGS_FILES = (config.config_path, config.client_callsign_path, config.server_callsign_path)
+CLIENT_SETTINGS_SECTIONS = ['RADIO', 'TNC', 'NOSTR', 'NETWORK', 'VARA', 'RETICULUM', 'FLDIGI']
+_settings_cache = {"mtimes": None, "body": None}
+_settings_lock = threading.Lock()
+
 def reload_config():
     """ Reload the settings by reloading the config module """
+    global SERVER_CALLSIGN
     importlib.reload(config)
+    SERVER_CALLSIGN = parse_callsign(config.HAMSTR_SERVER)
+
+def _settings_mtimes():
+    """Nanosecond mtimes of the settings files, so quick successive writes aren't missed."""
+    mtimes = []
+    for path in SETTINGS_FILES:
+        try:
+            mtimes.append(os.stat(path).st_mtime_ns)
+        except FileNotFoundError:
+            mtimes.append(None)
+    return tuple(mtimes)
+
+def _parse_callsign_setting(value):
+    callsign, ssid = config.parse_tuple(value)
+    return [callsign, ssid]
+
+def _parse_bool_setting(value):
+    if value.lower() not in ('true', 'false'):
+        raise ValueError(f"Not a boolean: {value}")
+    return value.lower() == 'true'
+
+def _setting_type(option, value):
+    """Work out an option's caster by trying each type against an ini value."""
+    # Handle callsign parsing - both _callsign AND hamstr_server
+    if (option.lower().endswith('_callsign') or 
+        option.lower() == 'hamstr_server'):
+        return _parse_callsign_setting
+    for caster in (int, float, _parse_bool_setting):
+        try:
+            caster(value)
+            return caster
+        except ValueError:
+            pass
+    return str
+
+def _build_option_types():
+    """Map (section, option) to a caster, derived from the values loaded at startup."""
+    option_types = {}
+    for parser, sections in ((config.config, config.config.sections()),
+                             (config.client_config, CLIENT_SETTINGS_SECTIONS)):
+        for section in sections:
+            if parser.has_section(section):
+                for option in parser.options(section):
+                    option_types[(section, option)] = _setting_type(option, parser.get(section, option))
+    return option_types
+
+_OPTION_TYPES = _build_option_types()
+
+def _parse_setting_value(section, option, value):
+    """Convert a raw ini value into the type the frontend expects."""
+    caster = _OPTION_TYPES.get((section, option))
+    if caster is None or caster is str:
+        # Unknown or blank-by-default options are typed from their current value
+        caster = _setting_type(option, value)
+    try:
+        return caster(value)
+    except ValueError:
+        # Value no longer fits its default's type (e.g. "3.5" in an int option)
+        return _setting_type(option, value)(value)
+
+def _rebuild_settings_cache():
+    """Reload config and rebuild the settings dict and setting_sections map."""
+    reload_config()
+    settings_dict = {}
+    sections = {}
+    
+    # Read from MAIN settings.ini (shared settings)
+    # Now includes GENERAL, NOSTR, PTT, NETWORK, VARA, RETICULUM, FLDIGI sections
+    for section in config.config.sections():
+        for option in config.config.options(section):
+            key = f"{section.upper()}_{option.upper()}"
+            settings_dict[key] = _parse_setting_value(section, option, config.config.get(section, option))
+            sections[key] = (section, option)
+
+    # OVERRIDE with CLIENT-SPECIFIC settings from client_config
+    # Include new NETWORK section for client-specific backend config
+    for section_name in CLIENT_SETTINGS_SECTIONS:
+        if config.client_config.has_section(section_name):
+            for option in config.client_config.options(section_name):
+                key = f"{section_name.upper()}_{option.upper()}"
+                settings_dict[key] = _parse_setting_value(section_name, option, config.client_config.get(section_name, option))
+                sections[key] = (section_name, option)
+
+    setting_sections.clear()
+    setting_sections.update(sections)
+    # Serialized once here so repeat GETs skip JSON encoding too
+    _settings_cache.update(mtimes=_settings_mtimes(), body=f"{app.json.dumps(settings_dict)}\n")
+
+def get_settings_body():
+    """Return the settings as a pre-serialized JSON body, rebuilt only when they change."""
+    with _settings_lock:
+        if _settings_cache["body"] is None or _settings_cache["mtimes"] != _settings_mtimes():
+            _rebuild_settings_cache()
+        return _settings_cache["body"]
+
+# Populate setting_sections at startup so the first POST can map every key
+_rebuild_settings_cache()
 
 
 def get_available_serial_ports():
@@ -856,7 +1079,7 @@ def backend_status():
 def settings():
     try:
         if request.method == 'POST':
-            data = request.json
+            data = parse_json_body(request)
             
             for key, value in data.items():
                 if key in setting_sections:
@@ -876,62 +1099,12 @@ def settings():
                     else:
                         config.update_config(section, option, str(value))
 
-            reload_config()
+            with _settings_lock:
+                _rebuild_settings_cache()
             return jsonify({"message": "Settings updated and applied successfully!"})
         
-        # GET method - FIXED to properly read client settings
-        reload_config()
-        settings_dict = {}
-        
-        # Read from MAIN settings.ini (shared settings)
-        # Now includes GENERAL, NOSTR, PTT, NETWORK, VARA, RETICULUM, FLDIGI sections
-        for section in config.config.sections():
-            for option in config.config.options(section):
-                key = f"{section.upper()}_{option.upper()}"
-                value = config.config.get(section, option)
-
-                # Handle callsign parsing - both _callsign AND hamstr_server  
-                if (option.lower().endswith('_callsign') or 
-                    option.lower() == 'hamstr_server'):
-                    callsign, ssid = config.parse_tuple(value)
-                    value = [callsign, ssid]
-                elif value.replace('.', '', 1).isdigit():
-                    value = float(value)
-                elif value.isdigit():
-                    value = int(value)
-                # Handle boolean values for new backend settings
-                elif value.lower() in ['true', 'false']:
-                    value = value.lower() == 'true'
-
-                settings_dict[key] = value
-                setting_sections[key] = (section, option)
-
-        # OVERRIDE with CLIENT-SPECIFIC settings from client_config
-        # Include new NETWORK section for client-specific backend config
-        client_sections = ['RADIO', 'TNC', 'NOSTR', 'NETWORK', 'VARA', 'RETICULUM', 'FLDIGI']
-        for section_name in client_sections:
-            if config.client_config.has_section(section_name):
-                for option in config.client_config.options(section_name):
-                    key = f"{section_name.upper()}_{option.upper()}"
-                    value = config.client_config.get(section_name, option)
-                    
-                    # Handle callsign parsing
-                    if (option.lower().endswith('_callsign') or 
-                        option.lower() == 'hamstr_server'):
-                        callsign, ssid = config.parse_tuple(value)
-                        value = [callsign, ssid]
-                    elif value.replace('.', '', 1).isdigit():
-                        value = float(value)
-                    elif value.isdigit():
-                        value = int(value)
-                    # Handle boolean values for backend settings
-                    elif value.lower() in ['true', 'false']:
-                        value = value.lower() == 'true'
-
-                    settings_dict[key] = value
-                    setting_sections[key] = (section_name, option)
-
-        return jsonify(settings_dict)
+        # GET method - served from the pre-serialized settings cache
+        return app.response_class(get_settings_body(), mimetype=app.json.mimetype)
 
     except Exception as e:
         print(f"Error handling settings request: {e}")
@@ -945,7 +1118,10 @@ def settings():
 @app.route('/api/nsec', methods=['GET', 'POST', 'DELETE'])
 def manage_nsec():
     if request.method == 'POST':
-        nsec = request.json.get('nsec')
+        try:
+            nsec = parse_json_body(request).get('nsec')
+        except ValueError:
+            return jsonify({'success': False, 'message': 'Invalid request format'}), 400
         if not nsec:
             return jsonify({'success': False, 'message': 'NSEC is required'}), 400
         
@@ -954,6 +1130,7 @@ def manage_nsec():
             return jsonify({'success': False, 'message': 'Invalid NSEC format'}), 400
             
         success = nsec_storage.store_nsec(nsec)
+        clear_signing_keys()
         return jsonify({
             'success': success,
             'message': 'NSEC stored successfully' if success else 'Failed to store NSEC'
@@ -968,6 +1145,7 @@ def manage_nsec():
         
     elif request.method == 'DELETE':
         success = nsec_storage.clear_nsec()
+        clear_signing_keys()
         return jsonify({
             'success': success,
             'message': 'NSEC cleared successfully' if success else 'Failed to clear NSEC'
@@ -978,12 +1156,9 @@ def manage_nsec():
 @app.route('/api/clear_notes', methods=['POST'])
 def clear_notes():
     try:
-        db_path = os.path.join(BASE_DIR, 'data', 'notes.db')
-        conn = sqlite3.connect(db_path)
-        c = conn.cursor()
-        c.execute("DELETE FROM notes")
-        conn.commit()
-        conn.close()
+        with db_writer() as conn:
+            conn.execute(CLEAR_NOTES_SQL)
+            conn.commit()
         socketio_logger.info("[DATABASE] Successfully cleared notes database")
         return jsonify({
             "success": True,
@@ -1021,7 +1196,7 @@ def get_serial_ports():
 def manage_nwc():
     """Manage NWC connection (similar to NSEC management)."""
     if request.method == 'POST':
-        data = request.get_json()
+        data = parse_json_body(request)
         nwc_uri = data.get('nwc_uri')
         
         if not nwc_uri:
@@ -1068,7 +1243,7 @@ def manage_nwc():
 def test_nwc_connection():
     """Test NWC connection while online (for setup phase)."""
     try:
-        data = request.get_json()
+        data = parse_json_body(request)
         nwc_uri = data.get('nwc_uri')
         
         if not nwc_uri:
@@ -1104,12 +1279,194 @@ def test_nwc_connection():
             'stored': False
         }), 500
 
+# Builds NWC payment commands off the radio worker so they overlap with over-the-air waits
+zap_prep_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="zap-prep")
+
+def prepare_nwc_command(invoice):
+    """Create the encrypted NWC payment command and compress it for transmission."""
+    if not NWC_PAYMENTS_AVAILABLE:
+        return None
+    nwc_command = create_nwc_payment_command(nwc_storage, invoice)
+    if not nwc_command:
+        return None
+    return compress_nostr_data(nwc_command)
+
+ZapRequest = collections.namedtuple(
+    'ZapRequest', 'recipient_lud16 amount_sats message zap_type note_id recipient_pubkey')
+
+class ZapRequestError(ValueError):
+    """Invalid send_zap payload; the message goes to the client, log_message to the log."""
+    def __init__(self, log_message, message):
+        super().__init__(message)
+        self.log_message = log_message
+
+def parse_zap_request(data):
+    """Validate a send_zap body in one pass and return a ZapRequest."""
+    if not isinstance(data, dict):
+        raise ZapRequestError("[DEBUG] JSON parse error: body is not an object", "Invalid request format")
+    
+    recipient_lud16 = data.get('recipient_lud16', '')
+    if not recipient_lud16 or not isinstance(recipient_lud16, str):
+        raise ZapRequestError("[CLIENT] No recipient Lightning address provided",
+                              "Recipient Lightning address is required")
+    
+    amount_sats = data.get('amount_sats', 0)
+    # JSON clients may send whole amounts as floats (e.g. 21.0)
+    if isinstance(amount_sats, float) and amount_sats.is_integer():
+        amount_sats = int(amount_sats)
+    if not isinstance(amount_sats, int) or isinstance(amount_sats, bool) or amount_sats <= 0:
+        raise ZapRequestError("[CLIENT] Invalid zap amount", "Zap amount must be greater than 0")
+    
+    recipient_pubkey = data.get('recipient_pubkey', '')
+    if not recipient_pubkey or not isinstance(recipient_pubkey, str):
+        raise ZapRequestError("[CLIENT] No recipient pubkey provided", "Recipient pubkey is required")
+    
+    try:
+        zap_type = ZapType(data.get('zap_type', 1))  # Convert integer to enum
+    except ValueError:
+        raise ZapRequestError(f"[CLIENT] Invalid zap type: {data.get('zap_type')}", "Invalid zap type")
+    
+    return ZapRequest(recipient_lud16, amount_sats, data.get('message', ''), zap_type,
+                      data.get('note_id'), recipient_pubkey)  # note_id only for note zaps
+
+def _zap_failure(log_message, message):
+    socketio_logger.error(log_message)
+    return {"success": False, "message": message}
+
+def packet_zap_exchange(session, compressed_note):
+    """Run the PacketProtocol zap exchange on an open session and return the result dict.
+
+    Sequence: zap note -> READY/READY -> invoice -> READY/READY -> NWC command
+    -> READY/READY -> payment result -> ZAP_SUCCESS_CONFIRM or ZAP_FAILED.
+    """
+    socketio_logger.info("[CLIENT] Sending kind 9734 zap note via ZAP_KIND9734_REQUEST")
+    
+    # PHASE 1: KIND 9734 → LIGHTNING INVOICE (working flow)
+    # Step 1: Send zap note packets + DONE
+    if not client.core.message_processor.send_message(session, compressed_note, MessageType.ZAP_KIND9734_REQUEST):
+        return _zap_failure("[CLIENT] Failed to send zap note", "Failed to send zap note")
+    socketio_logger.info("[CLIENT] Zap packets and DONE sent successfully")
+    
+    # Step 2: Wait for server READY (server is ready to send invoice)
+    if not client.core.wait_for_specific_message(session, MessageType.READY):
+        return _zap_failure("[CLIENT] Server not ready to send invoice", "Server not ready to send invoice")
+    socketio_logger.info("[CLIENT] Received READY from server, sending READY")
+    
+    # Step 3: Send client READY (client is ready to receive invoice)
+    if not client.core.send_ready(session):
+        return _zap_failure("[CLIENT] Failed to send READY for invoice", "Failed to send READY for invoice")
+    socketio_logger.info("[CLIENT] READY sent, waiting for invoice response")
+    
+    # Step 4: Wait for invoice response (ORIGINAL WORKING METHOD)
+    response = client.core.receive_response(session)
+    if not response:
+        return _zap_failure("[CLIENT] No invoice response received", "No invoice received from server")
+    socketio_logger.info("[CLIENT] Received invoice response")
+    
+    try:
+        # Decompress and parse invoice response
+        decompressed_response = decompress_nostr_data(response)
+        invoice_data = app.json.loads(decompressed_response)
+        
+        if not invoice_data.get('success'):
+            error = invoice_data.get('error', 'Invoice generation failed')
+            return _zap_failure(f"[CLIENT] Invoice generation failed: {error}", f"Invoice generation failed: {error}")
+        
+        invoice = invoice_data.get('invoice')
+        amount = invoice_data.get('amount_sats')
+        socketio_logger.info("[CLIENT] Lightning Invoice: %s... for %s sats", invoice[:50], amount)
+        
+        # PHASE 2: NWC PAYMENT → PAYMENT RESULT
+        # Step 5: Create encrypted NWC payment command
+        # (encrypted and compressed on a helper thread while the READY exchange below is on air)
+        socketio_logger.info("[CLIENT] Creating encrypted NWC payment command")
+        nwc_future = zap_prep_executor.submit(prepare_nwc_command, invoice)
+    except Exception as e:
+        return _zap_failure(f"[CLIENT] Error parsing invoice response: {e}", f"Invoice parsing error: {str(e)}")
+    
+    # Step 6: Send client READY (client ready to send NWC command)
+    if not client.core.send_ready(session):
+        return _zap_failure("[CLIENT] Failed to send READY for NWC command", "Failed to send READY for NWC command")
+    socketio_logger.info("[CLIENT] Sent READY for NWC command transmission")
+    
+    # Step 7: Wait for server READY (server ready to receive NWC command)
+    if not client.core.wait_for_specific_message(session, MessageType.READY):
+        return _zap_failure("[CLIENT] Server not ready for NWC command", "Server not ready to receive NWC command")
+    socketio_logger.info("[CLIENT] Server READY received, sending NWC command")
+    
+    try:
+        compressed_nwc_command = nwc_future.result()
+    except Exception as e:
+        socketio_logger.error("[NWC] Error creating payment command: %s", e)
+        compressed_nwc_command = None
+    if not compressed_nwc_command:
+        return _zap_failure("[CLIENT] Failed to create NWC payment command", "Failed to create NWC payment command")
+    
+    # Step 8: Send encrypted NWC payment command
+    if not client.core.message_processor.send_message(session, compressed_nwc_command, MessageType.NWC_PAYMENT_REQUEST):
+        return _zap_failure("[CLIENT] Failed to send NWC command", "Failed to send NWC payment command")
+    socketio_logger.info("[CLIENT] NWC command sent, waiting for payment response")
+    
+    # Wait for payment response from server
+    if not client.core.wait_for_specific_message(session, MessageType.READY, timeout=30):
+        return _zap_failure("[CLIENT] Server not ready for payment response", "Server not ready for payment response")
+    socketio_logger.info("[CLIENT] Server READY received for payment response")
+    
+    # Send client READY to receive payment result
+    if not client.core.send_ready(session):
+        return _zap_failure("[CLIENT] Failed to send READY for payment response", "Failed to send READY for payment response")
+    socketio_logger.info("[CLIENT] Sent READY for payment response")
+    
+    # Receive payment response
+    payment_response = client.core.receive_response(session)
+    if not payment_response:
+        return _zap_failure("[CLIENT] No payment response received", "Payment response timeout")
+    
+    try:
+        decompressed_payment = decompress_nostr_data(payment_response)
+        payment_result = app.json.loads(decompressed_payment)
+        
+        if payment_result.get('success'):
+            socketio_logger.info("[CLIENT] ⚡ Zap payment successful! Sending success confirmation to server")
+            
+            # Send success confirmation to server
+            client.core.send_single_packet(
+                session, 0, 0, 
+                "ZAP_SUCCESS".encode(), 
+                MessageType.ZAP_SUCCESS_CONFIRM
+            )
+            
+            # Wait for server's final acknowledgment/message
+            socketio_logger.info("[CLIENT] Waiting for server disconnect...")
+            time.sleep(1)  # Brief delay for server processing
+            
+            socketio_logger.info("[CLIENT] Zap session completed successfully")
+            return {
+                "success": True,
+                "message": "Zap sent successfully"
+            }
+        
+        error = payment_result.get('error', 'Payment failed')
+        socketio_logger.error("[CLIENT] Payment failed: %s", error)
+        
+        # Send failure notification to server
+        client.core.send_single_packet(
+            session, 0, 0,
+            "ZAP_FAILED".encode(),
+            MessageType.ZAP_FAILED
+        )
+        
+        return {
+            "success": False,
+            "message": f"Payment failed: {error}"
+        }
+    except Exception as e:
+        return _zap_failure(f"[CLIENT] Error parsing payment response: {e}", f"Payment response error: {str(e)}")
+
 @app.route('/api/send_zap', methods=['POST'])
 def send_zap():
     """Send zap request via ham radio using new kind 9734 flow."""
-    global radio_operation_in_progress
-    
-    if radio_operation_in_progress:
+    if radio_busy():
         socketio_logger.info("[SYSTEM] Cannot send zap - radio operation in progress")
         return jsonify({
             "success": False, 
@@ -1117,7 +1474,7 @@ def send_zap():
         }), 500
 
     try:
-        data = request.get_json()
+        data = parse_json_body(request)
         socketio_logger.info("[DEBUG] Parsed zap JSON data: %s", data)
     except Exception as e:
         socketio_logger.error("[DEBUG] JSON parse error: %s", str(e))
@@ -1126,41 +1483,21 @@ def send_zap():
             "message": "Invalid request format"
         }), 400
 
-    # Extract zap data
-    recipient_lud16 = data.get('recipient_lud16', '')
-    amount_sats = data.get('amount_sats', 0)
-    message = data.get('message', '')
-    zap_type = ZapType(data.get('zap_type', 1))  # Convert integer to enum
-    note_id = data.get('note_id')  # For note zaps
-    recipient_pubkey = data.get('recipient_pubkey', '')
-
-    socketio_logger.info(f"[SYSTEM] About to check e tag condition:")
-    socketio_logger.info(f"[SYSTEM] zap_type: {zap_type} (type: {type(zap_type)})")
-    socketio_logger.info(f"[SYSTEM] ZapType.NOTE_ZAP: {ZapType.NOTE_ZAP} (type: {type(ZapType.NOTE_ZAP)})")
-    socketio_logger.info(f"[SYSTEM] note_id: {note_id}")
-    socketio_logger.info(f"[SYSTEM] zap_type == ZapType.NOTE_ZAP: {zap_type == ZapType.NOTE_ZAP}")    
-    
-    # Validate inputs
-    if not recipient_lud16:
-        socketio_logger.error("[CLIENT] No recipient Lightning address provided")
-        return jsonify({
-            "success": False,
-            "message": "Recipient Lightning address is required"
-        }), 400
-    
-    if amount_sats <= 0:
-        socketio_logger.error("[CLIENT] Invalid zap amount")
-        return jsonify({
-            "success": False,
-            "message": "Zap amount must be greater than 0"
-        }), 400
-    
-    if not recipient_pubkey:
-        socketio_logger.error("[CLIENT] No recipient pubkey provided")
+    # Extract and validate zap data
+    try:
+        recipient_lud16, amount_sats, message, zap_type, note_id, recipient_pubkey = parse_zap_request(data)
+    except ZapRequestError as e:
+        socketio_logger.error(e.log_message)
         return jsonify({
             "success": False,
-            "message": "Recipient pubkey is required"
+            "message": str(e)
         }), 400
+
+    socketio_logger.info("[SYSTEM] About to check e tag condition:")
+    socketio_logger.info("[SYSTEM] zap_type: %s (type: %s)", zap_type, type(zap_type))
+    socketio_logger.info("[SYSTEM] ZapType.NOTE_ZAP: %s (type: %s)", ZapType.NOTE_ZAP, type(ZapType.NOTE_ZAP))
+    socketio_logger.info("[SYSTEM] note_id: %s", note_id)
+    socketio_logger.info("[SYSTEM] zap_type == ZapType.NOTE_ZAP: %s", zap_type == ZapType.NOTE_ZAP)    
     
     # Check for NWC connection
     if not nwc_storage.has_nwc_connection():
@@ -1190,56 +1527,55 @@ def send_zap():
             }), 400
         
         # Create kind 9734 zap note
-        keys = Keys.parse(nsec)
+        keys, _ = get_signing_keys(nsec)
         
-        # Build zap note tags (REPLACE the entire tag section with this)
-        tags = [
-            Tag.parse(["amount", str(amount_sats * 1000)]),  # Amount in millisats
-            Tag.parse(["lnaddr", recipient_lud16]),           # Lightning address
-            Tag.parse(["p", recipient_pubkey])                # Recipient pubkey
+        # Build zap note tag values, then parse them in one pass
+        tag_values = [
+            ["amount", str(amount_sats * 1000)],  # Amount in millisats
+            ["lnaddr", recipient_lud16],           # Lightning address
+            ["p", recipient_pubkey]                # Recipient pubkey
         ]
 
-
         # Add note reference for note zaps ONLY
         if zap_type == ZapType.NOTE_ZAP and note_id:
-            tags.append(Tag.parse(["e", note_id]))
-            socketio_logger.info(f"[CLIENT] Added e tag for note zap: {note_id}")
+            tag_values.append(["e", note_id])
+            socketio_logger.info("[CLIENT] Added e tag for note zap: %s", note_id)
         elif zap_type == ZapType.PROFILE_ZAP:
-            socketio_logger.info(f"[CLIENT] Profile zap - no e tag needed")
+            socketio_logger.info("[CLIENT] Profile zap - no e tag needed")
 
         # Add NWC relay for server processing
-        tags.append(Tag.parse(["relay", nwc_relay]))
+        tag_values.append(["relay", nwc_relay])
+
+        tags = [Tag.parse(values) for values in tag_values]
 
         # Add publishing relays for better zap distribution
-        tags.append(Tag.parse(["relays", "wss://nos.lol", "wss://relay.damus.io"]))
+        tags.append(ZAP_PUBLISH_RELAYS_TAG)
 
         # Create and sign the kind 9734 event
-        builder = EventBuilder(Kind(9734), message, tags)
+        builder = EventBuilder(KIND_ZAP_REQUEST, message, tags)
         signed_event = builder.to_event(keys)
         
         # Convert to JSON and compress for transmission
         zap_note_json = signed_event.as_json()
         compressed_note = compress_nostr_data(zap_note_json)
      
-        socketio_logger.info(f"[CLIENT] Preparing to send kind 9734 zap note: {amount_sats} sats to {recipient_lud16}")
+        socketio_logger.info("[CLIENT] Preparing to send kind 9734 zap note: %s sats to %s", amount_sats, recipient_lud16)
         
         # Use existing radio infrastructure
-        radio_operation_in_progress = True
         result_container = [None]
         
         def radio_operation():
             nonlocal result_container
             try:
                 # Use global client instance (matches send_note and request_notes)
-                server_callsign = parse_callsign(config.HAMSTR_SERVER)
+                server_callsign = SERVER_CALLSIGN
 
                 # Log connection attempt
-                socketio_logger.info(f"[CLIENT] Connecting to {server_callsign[0]}-{server_callsign[1]}...")
+                socketio_logger.info("[CLIENT] Connecting to %s-%s...", server_callsign[0], server_callsign[1])
 
                 session = client.core.connect(server_callsign)
                 if not session:
-                    socketio_logger.error(f"[CLIENT] Unable to connect to {server_callsign[0]}-{server_callsign[1]}")
-                    result_container[0] = {"success": False, "message": f"Unable to connect to {server_callsign[0]}-{server_callsign[1]}"}
+                    result_container[0] = _zap_failure(f"[CLIENT] Unable to connect to {server_callsign[0]}-{server_callsign[1]}", f"Unable to connect to {server_callsign[0]}-{server_callsign[1]}")
                     return
                 
                 # Detect protocol type
@@ -1247,7 +1583,7 @@ def send_zap():
                 if hasattr(client.core, 'protocol_manager') and client.core.protocol_manager:
                     protocol_type = client.core.protocol_manager.get_protocol_type()
                 
-                socketio_logger.info(f"[CLIENT] Using {protocol_type} for zap")
+                socketio_logger.info("[CLIENT] Using %s for zap", protocol_type)
                 
                 #==============================================================
                 # DirectProtocol Flow (VARA, Reticulum, FLDIGI)
@@ -1264,8 +1600,7 @@ def send_zap():
                         
                         success = client.core.protocol_manager.send_nostr_request(session, zap_request)
                         if not success:
-                            socketio_logger.error("[ZAP] Failed to send zap request")
-                            result_container[0] = {"success": False, "message": "Failed to send zap request"}
+                            result_container[0] = _zap_failure("[ZAP] Failed to send zap request", "Failed to send zap request")
                             return
                         
                         socketio_logger.info("[ZAP] Zap request sent, waiting for invoice")
@@ -1274,41 +1609,35 @@ def send_zap():
                         invoice_response = client.core.protocol_manager.receive_nostr_response(session, timeout=60)
                         
                         if not invoice_response:
-                            socketio_logger.error("[ZAP] Timeout waiting for invoice")
-                            result_container[0] = {"success": False, "message": "Invoice timeout"}
+                            result_container[0] = _zap_failure("[ZAP] Timeout waiting for invoice", "Invoice timeout")
                             return
                         
                         if invoice_response.get('type') == 'ZAP_ERROR':
                             error = invoice_response.get('data', {}).get('error', 'Unknown error')
-                            socketio_logger.error(f"[ZAP] Server error: {error}")
-                            result_container[0] = {"success": False, "message": error}
+                            result_container[0] = _zap_failure(f"[ZAP] Server error: {error}", error)
                             return
                         
                         if invoice_response.get('type') != 'ZAP_INVOICE':
-                            socketio_logger.error(f"[ZAP] Unexpected response type: {invoice_response.get('type')}")
-                            result_container[0] = {"success": False, "message": "Unexpected response"}
+                            result_container[0] = _zap_failure(f"[ZAP] Unexpected response type: {invoice_response.get('type')}", "Unexpected response")
                             return
                         
                         invoice_data = invoice_response.get('data', {})
                         invoice = invoice_data.get('invoice')
                         
                         if not invoice:
-                            socketio_logger.error("[ZAP] No invoice in response")
-                            result_container[0] = {"success": False, "message": "No invoice received"}
+                            result_container[0] = _zap_failure("[ZAP] No invoice in response", "No invoice received")
                             return
                         
-                        socketio_logger.info(f"[ZAP] Invoice received: {invoice[:50]}...")
+                        socketio_logger.info("[ZAP] Invoice received: %s...", invoice[:50])
                         
                         # PHASE 2: Create and send NWC payment command
                         socketio_logger.info("[ZAP] Creating encrypted NWC payment command")
                         
                         # Create encrypted NWC payment command
-                        from nostr import create_nwc_payment_command
-                        nwc_command = create_nwc_payment_command(nwc_storage, invoice)
+                        nwc_command = create_nwc_payment_command(nwc_storage, invoice) if NWC_PAYMENTS_AVAILABLE else None
                         
                         if not nwc_command:
-                            socketio_logger.error("[ZAP] Failed to create NWC payment command")
-                            result_container[0] = {"success": False, "message": "Failed to create payment command"}
+                            result_container[0] = _zap_failure("[ZAP] Failed to create NWC payment command", "Failed to create payment command")
                             return
                         
                         # Send NWC payment request
@@ -1321,8 +1650,7 @@ def send_zap():
                         
                         success = client.core.protocol_manager.send_nostr_request(session, nwc_request)
                         if not success:
-                            socketio_logger.error("[ZAP] Failed to send NWC payment")
-                            result_container[0] = {"success": False, "message": "Failed to send payment"}
+                            result_container[0] = _zap_failure("[ZAP] Failed to send NWC payment", "Failed to send payment")
                             return
                         
                         socketio_logger.info("[ZAP] NWC payment sent, waiting for response")
@@ -1331,13 +1659,11 @@ def send_zap():
                         payment_response = client.core.protocol_manager.receive_nostr_response(session, timeout=120)
                         
                         if not payment_response:
-                            socketio_logger.error("[ZAP] Timeout waiting for payment response")
-                            result_container[0] = {"success": False, "message": "Payment timeout"}
+                            result_container[0] = _zap_failure("[ZAP] Timeout waiting for payment response", "Payment timeout")
                             return
                         
                         if payment_response.get('type') != 'NWC_RESPONSE':
-                            socketio_logger.error(f"[ZAP] Unexpected response type: {payment_response.get('type')}")
-                            result_container[0] = {"success": False, "message": "Unexpected response"}
+                            result_container[0] = _zap_failure(f"[ZAP] Unexpected response type: {payment_response.get('type')}", "Unexpected response")
                             return
                         
                         payment_data = payment_response.get('data', {})
@@ -1347,8 +1673,7 @@ def send_zap():
                             result_container[0] = {"success": True, "message": "Zap sent successfully"}
                         else:
                             error = payment_data.get('error', 'Payment failed')
-                            socketio_logger.error(f"[ZAP] Payment failed: {error}")
-                            result_container[0] = {"success": False, "message": error}
+                            result_container[0] = _zap_failure(f"[ZAP] Payment failed: {error}", error)
                         
                         # Clean disconnect
                         socketio_logger.info("[ZAP] Sending DONE signal")
@@ -1369,8 +1694,7 @@ def send_zap():
                         socketio_logger.info("[ZAP] Zap operation complete")
                         
                     except Exception as e:
-                        socketio_logger.error(f"[ZAP] DirectProtocol zap error: {e}")
-                        result_container[0] = {"success": False, "message": str(e)}
+                        result_container[0] = _zap_failure(f"[ZAP] DirectProtocol zap error: {e}", str(e))
                     finally:
                         if session:
                             client.core.backend_manager.disconnect(session)
@@ -1379,203 +1703,7 @@ def send_zap():
                 # PacketProtocol Flow (Packet Radio - EXISTING CODE)
                 #==============================================================
                 else:
-                    socketio_logger.info("[CLIENT] Sending kind 9734 zap note via ZAP_KIND9734_REQUEST")
-                    
-                    # PHASE 1: KIND 9734 → LIGHTNING INVOICE (working flow)
-                    # Step 1: Send zap note packets + DONE
-                    success = client.core.message_processor.send_message(session, compressed_note, MessageType.ZAP_KIND9734_REQUEST)
-                    
-                    if success:
-                        socketio_logger.info("[CLIENT] Zap packets and DONE sent successfully")
-                        
-                        # Step 2: Wait for server READY (server is ready to send invoice)
-                        if client.core.wait_for_specific_message(session, MessageType.READY):
-                            socketio_logger.info("[CLIENT] Received READY from server, sending READY")
-                            
-                            # Step 3: Send client READY (client is ready to receive invoice)
-                            if client.core.send_ready(session):
-                                socketio_logger.info("[CLIENT] READY sent, waiting for invoice response")
-                                
-                                # Step 4: Wait for invoice response (ORIGINAL WORKING METHOD)
-                                response = client.core.receive_response(session)
-                                
-                                if response:
-                                    socketio_logger.info("[CLIENT] Received invoice response")
-                                    
-                                    try:
-                                        # Decompress and parse invoice response
-                                        decompressed_response = decompress_nostr_data(response)
-                                        invoice_data = json.loads(decompressed_response)
-                                        
-                                        if invoice_data.get('success'):
-                                            invoice = invoice_data.get('invoice')
-                                            amount = invoice_data.get('amount_sats')
-                                            
-                                            socketio_logger.info(f"[CLIENT] Lightning Invoice: {invoice[:50]}... for {amount} sats")
-                                            
-                                            # PHASE 2: NWC PAYMENT → PAYMENT RESULT
-                                            # Step 5: Create encrypted NWC payment command
-                                            socketio_logger.info("[CLIENT] Creating encrypted NWC payment command")
-                                            from nostr import create_nwc_payment_command
-                                            nwc_command = create_nwc_payment_command(nwc_storage, invoice)
-                        
-                                            
-                                            if nwc_command:
-                                                # Prepare NWC command for transmission
-                                                compressed_nwc_command = compress_nostr_data(nwc_command)
-                                                
-                                                # Step 6: Send client READY (client ready to send NWC command)
-                                                if client.core.send_ready(session):
-                                                    socketio_logger.info("[CLIENT] Sent READY for NWC command transmission")
-                                                    
-                                                    # Step 7: Wait for server READY (server ready to receive NWC command)
-                                                    if client.core.wait_for_specific_message(session, MessageType.READY):
-                                                        socketio_logger.info("[CLIENT] Server READY received, sending NWC command")
-                                                        
-                                                        # Step 8: Send encrypted NWC payment command
-                                                        nwc_success = client.core.message_processor.send_message(
-                                                            session, compressed_nwc_command, MessageType.NWC_PAYMENT_REQUEST
-                                                        )
-                                                        
-                                                        if nwc_success:
-                                                            socketio_logger.info("[CLIENT] NWC command sent, waiting for payment response")
-                                                            
-                                                            # Wait for payment response from server
-                                                            if client.core.wait_for_specific_message(session, MessageType.READY, timeout=30):
-                                                                socketio_logger.info("[CLIENT] Server READY received for payment response")
-                                                                
-                                                                # Send client READY to receive payment result
-                                                                if client.core.send_ready(session):
-                                                                    socketio_logger.info("[CLIENT] Sent READY for payment response")
-                                                                    
-                                                                    # Receive payment response
-                                                                    payment_response = client.core.receive_response(session)
-                                                                    
-                                                                    if payment_response:
-                                                                        try:
-                                                                            decompressed_payment = decompress_nostr_data(payment_response)
-                                                                            payment_result = json.loads(decompressed_payment)
-                                                                            
-                                                                            if payment_result.get('success'):
-                                                                                socketio_logger.info("[CLIENT] ⚡ Zap payment successful! Sending success confirmation to server")
-                                                                                
-                                                                                # Send success confirmation to server
-                                                                                client.core.send_single_packet(
-                                                                                    session, 0, 0, 
-                                                                                    "ZAP_SUCCESS".encode(), 
-                                                                                    MessageType.ZAP_SUCCESS_CONFIRM
-                                                                                )
-                                                                                
-                                                                                # Wait for server's final acknowledgment/message
-                                                                                socketio_logger.info("[CLIENT] Waiting for server disconnect...")
-                                                                                time.sleep(1)  # Brief delay for server processing
-                                                                                
-                                                                                result_container[0] = {
-                                                                                    "success": True,
-                                                                                    "message": "Zap sent successfully"
-                                                                                }
-                                                                                
-                                                                                socketio_logger.info("[CLIENT] Zap session completed successfully")
-                                                                            else:
-                                                                                error = payment_result.get('error', 'Payment failed')
-                                                                                socketio_logger.error(f"[CLIENT] Payment failed: {error}")
-                                                                                
-                                                                                # Send failure notification to server
-                                                                                client.core.send_single_packet(
-                                                                                    session, 0, 0,
-                                                                                    "ZAP_FAILED".encode(),
-                                                                                    MessageType.ZAP_FAILED
-                                                                                )
-                                                                                
-                                                                                result_container[0] = {
-                                                                                    "success": False,
-                                                                                    "message": f"Payment failed: {error}"
-                                                                                }
-                                                                        except Exception as e:
-                                                                            socketio_logger.error(f"[CLIENT] Error parsing payment response: {e}")
-                                                                            result_container[0] = {
-                                                                                "success": False,
-                                                                                "message": f"Payment response error: {str(e)}"
-                                                                            }
-                                                                    else:
-                                                                        socketio_logger.error("[CLIENT] No payment response received")
-                                                                        result_container[0] = {
-                                                                            "success": False,
-                                                                            "message": "Payment response timeout"
-                                                                        }
-                                                                else:
-                                                                    socketio_logger.error("[CLIENT] Failed to send READY for payment response")
-                                                                    result_container[0] = {
-                                                                        "success": False,
-                                                                        "message": "Failed to send READY for payment response"
-                                                                    }
-                                                            else:
-                                                                socketio_logger.error("[CLIENT] Server not ready for payment response")
-                                                                result_container[0] = {
-                                                                    "success": False,
-                                                                    "message": "Server not ready for payment response"
-                                                                }
-                                                        else:
-                                                            socketio_logger.error("[CLIENT] Failed to send NWC command")
-                                                            result_container[0] = {
-                                                                "success": False,
-                                                                "message": "Failed to send NWC payment command"
-                                                            }
-                                                    else:
-                                                        socketio_logger.error("[CLIENT] Server not ready for NWC command")
-                                                        result_container[0] = {
-                                                            "success": False,
-                                                            "message": "Server not ready to receive NWC command"
-                                                        }
-                                                else:
-                                                    socketio_logger.error("[CLIENT] Failed to send READY for NWC command")
-                                                    result_container[0] = {
-                                                        "success": False,
-                                                        "message": "Failed to send READY for NWC command"
-                                                    }
-                                            else:
-                                                socketio_logger.error("[CLIENT] Failed to create NWC payment command")
-                                                result_container[0] = {
-                                                    "success": False,
-                                                    "message": "Failed to create NWC payment command"
-                                                }
-                                        else:
-                                            error = invoice_data.get('error', 'Invoice generation failed')
-                                            socketio_logger.error(f"[CLIENT] Invoice generation failed: {error}")
-                                            result_container[0] = {
-                                                "success": False,
-                                                "message": f"Invoice generation failed: {error}"
-                                            }
-                                    except Exception as e:
-                                        socketio_logger.error(f"[CLIENT] Error parsing invoice response: {e}")
-                                        result_container[0] = {
-                                            "success": False,
-                                            "message": f"Invoice parsing error: {str(e)}"
-                                        }
-                                else:
-                                    socketio_logger.error("[CLIENT] No invoice response received")
-                                    result_container[0] = {
-                                        "success": False,
-                                        "message": "No invoice received from server"
-                                    }
-                            else:
-                                socketio_logger.error("[CLIENT] Failed to send READY for invoice")
-                                result_container[0] = {
-                                    "success": False,
-                                    "message": "Failed to send READY for invoice"
-                                }
-                        else:
-                            socketio_logger.error("[CLIENT] Server not ready to send invoice")
-                            result_container[0] = {
-                                "success": False,
-                                "message": "Server not ready to send invoice"
-                            }
-                    else:
-                        socketio_logger.error("[CLIENT] Failed to send zap note")
-                        result_container[0] = {
-                            "success": False,
-                            "message": "Failed to send zap note"
-                        }
+                    result_container[0] = packet_zap_exchange(session, compressed_note)
                     
                     # Wait for server disconnect
                     if client.core.wait_for_specific_message(session, MessageType.DISCONNECT, timeout=10):
@@ -1587,16 +1715,21 @@ def send_zap():
                         client.core.disconnect(session)
                         
             except Exception as e:
-                    socketio_logger.error(f"[CLIENT] Hardware/Protocol error: {e}")
+                    socketio_logger.error("[CLIENT] Hardware/Protocol error: %s", e)
                     # Pass through the actual backend error message
                     result_container[0] = {"success": False, "message": str(e)}
                 
-        # Execute radio operation in thread
-        radio_thread = threading.Thread(target=radio_operation)
-        radio_thread.start()
+        # Execute radio operation on the radio worker
+        future = submit_radio_task(radio_operation)
+        if future is None:
+            socketio_logger.info("[SYSTEM] Cannot send zap - radio operation in progress")
+            return jsonify({
+                "success": False, 
+                "message": "Cannot send zap - radio operation in progress"
+            }), 500
         
-        # Wait for thread to complete (no timeout - let it run)
-        radio_thread.join()
+        # Wait for it to complete (no timeout - let it run)
+        future.result()
         
         # Return result or default error
         result = result_container[0]
@@ -1606,21 +1739,44 @@ def send_zap():
         return jsonify(result)
         
     except Exception as e:
-        socketio_logger.error(f"[CLIENT] Error creating zap note: {e}")
+        socketio_logger.error("[CLIENT] Error creating zap note: %s", e)
         return jsonify({
             "success": False,
             "message": f"Error creating zap note: {str(e)}"
         }), 500
-    finally:
-        radio_operation_in_progress = False
         
 # Static file routes
+
+# SvelteKit emits content-hashed bundles under _app/immutable/, so they can be cached forever
+IMMUTABLE_ASSET_PREFIX = '_app/immutable/'
+IMMUTABLE_ASSET_MAX_AGE = 31536000
+# Pre-compressed siblings written by the frontend build, in order of preference
+PRECOMPRESSED_ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+
+def send_static_asset(path):
+    """Send a frontend file, preferring a .br/.gz variant the client accepts."""
+    for encoding, suffix in PRECOMPRESSED_ENCODINGS:
+        if request.accept_encodings[encoding] and os.path.exists(os.path.join(app.static_folder, path + suffix)):
+            mimetype = mimetypes.guess_type(path)[0] or 'application/octet-stream'
+            response = send_from_directory(app.static_folder, path + suffix, mimetype=mimetype)
+            response.headers['Content-Encoding'] = encoding
+            break
+    else:
+        response = send_from_directory(app.static_folder, path)
+    response.vary.add('Accept-Encoding')
+    
+    if path.startswith(IMMUTABLE_ASSET_PREFIX):
+        response.cache_control.public = True
+        response.cache_control.max_age = IMMUTABLE_ASSET_MAX_AGE
+        response.cache_control.immutable = True
+    return response
+
 @app.route('/', defaults={'path': ''})
 @app.route('/<path:path>')
 def serve_static(path):
     if path and os.path.exists(os.path.join(app.static_folder, path)):
-        return send_from_directory(app.static_folder, path)
-    return send_from_directory(app.static_folder, 'index.html')
+        return send_static_asset(path)
+    return send_static_asset('index.html')
 
 if __name__ == '__main__':
     socketio.run(app, host='0.0.0.0', port=5000, debug=False)
\ No newline at end of file
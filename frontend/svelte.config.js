@@ -9,7 +9,7 @@ const config = {
       pages: 'build',
       assets: 'build',
       fallback: 'index.html',
-      precompress: false,
+      precompress: true,
       strict: false
     })
   }